@@ -1,23 +1,54 @@
-from .dumpling import Dumpling, DumplingDriver
-from .dumplingchef import DumplingChef
-from .dumplingeater import DumplingEater
-from .exceptions import (
-    InvalidDumpling, InvalidDumplingPayload, NetDumplingsError,
-)
-from .dumplinghub import DumplingHub
-from .dumplingkitchen import DumplingKitchen
+import importlib
+
 from ._version import __version__
 
-# Workaround to avoid F401 "imported but unused" linter errors.
-(
-    Dumpling,
-    DumplingDriver,
-    DumplingChef,
-    DumplingEater,
-    DumplingHub,
-    DumplingKitchen,
-    InvalidDumpling,
-    InvalidDumplingPayload,
-    NetDumplingsError,
-    __version__,
-)
+# The main netdumplings classes are exported lazily (PEP 562) so that
+# importing the package -- which every console script does just to find
+# __version__ -- doesn't also drag in websockets, scapy, etc. Each entry maps
+# an exported name to the (module, attribute) it comes from.
+_LAZY_EXPORTS = {
+    'Dumpling': ('netdumplings.dumpling', 'Dumpling'),
+    'DumplingDriver': ('netdumplings.dumpling', 'DumplingDriver'),
+    'DumplingChef': ('netdumplings.dumplingchef', 'DumplingChef'),
+    'DumplingEater': ('netdumplings.dumplingeater', 'DumplingEater'),
+    'DumplingHub': ('netdumplings.dumplinghub', 'DumplingHub'),
+    'DumplingKitchen': ('netdumplings.dumplingkitchen', 'DumplingKitchen'),
+    'InvalidDumpling': ('netdumplings.exceptions', 'InvalidDumpling'),
+    'InvalidDumplingPayload': (
+        'netdumplings.exceptions', 'InvalidDumplingPayload'
+    ),
+    'NetDumplingsError': ('netdumplings.exceptions', 'NetDumplingsError'),
+}
+
+__all__ = [
+    'Dumpling',
+    'DumplingDriver',
+    'DumplingChef',
+    'DumplingEater',
+    'DumplingHub',
+    'DumplingKitchen',
+    'InvalidDumpling',
+    'InvalidDumplingPayload',
+    'NetDumplingsError',
+    '__version__',
+]
+
+
+def __getattr__(name):
+    try:
+        module_name, attr_name = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(
+            'module {!r} has no attribute {!r}'.format(__name__, name)
+        ) from None
+
+    value = getattr(importlib.import_module(module_name), attr_name)
+
+    # Cache the resolved value so __getattr__ is only hit once per name.
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
@@ -5,6 +5,11 @@ import os
 import time
 from typing import Dict, List, Union
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .exceptions import InvalidDumpling
 
 
@@ -12,9 +17,12 @@ from .exceptions import InvalidDumpling
 JSONSerializable = Union[str, int, List, Dict, None]
 
 # Tuples of (code, msg) for sending when closing websocket connections.
+ND_CLOSE_CONN_CANCELLED = (4101, "connection cancelled")
+ND_CLOSE_EATER_FULL = (4102, "dumpling eater is full")
+
 ND_CLOSE_MSGS = {
-    'conn_cancelled': (4101, "connection cancelled"),
-    'eater_full': (4102, "dumpling eater is full"),
+    'conn_cancelled': ND_CLOSE_CONN_CANCELLED,
+    'eater_full': ND_CLOSE_EATER_FULL,
 }
 
 LOGGING_CONFIG_FILE = os.path.join(
@@ -26,45 +34,208 @@ HUB_IN_PORT = 11347
 HUB_OUT_PORT = 11348
 HUB_STATUS_FREQ = 5
 
+# Maximum number of dumplings, and bytes, in a single batched websocket message
+# (from nd-sniff to nd-hub, or from nd-hub to a dumpling eater which has asked
+# for batched dumplings). The byte limit counts the UTF-8 encoded dumplings and
+# the newlines between them, and keeps batches well within the 1 MiB maximum
+# message size which websockets allows by default. A single dumpling which is
+# bigger than the byte limit is sent in a message of its own.
+HUB_MAX_BATCH_SIZE = 100
+HUB_MAX_BATCH_BYTES = 2 ** 19
+
+# Maximum number of batches of dumplings nd-sniff will hold while they wait to
+# be sent to nd-hub. Dumplings made while the queue is full are dropped. Each
+# batch holds up to KITCHEN_DUMPLING_BATCH_SIZE dumplings, so the queue holds
+# up to 4096 dumplings when they're made quickly enough to fill their batches.
+# When dumplings are made slowly, batches are flushed after only a few
+# dumplings, and the queue fills up with fewer dumplings.
+KITCHEN_MAX_QUEUED_BATCHES = 128
+
+# nd-sniff's kitchen passes dumplings to the process which sends them to
+# nd-hub in batches of up to this many dumplings, waiting at most this many
+# seconds for a batch to fill up.
+KITCHEN_DUMPLING_BATCH_SIZE = 32
+KITCHEN_DUMPLING_BATCH_INTERVAL = 0.005
+
+# Default HOST:PORT addresses for talking to nd-hub.
+HUB_IN_ADDRESS = '{}:{}'.format(HUB_HOST, HUB_IN_PORT)
+HUB_OUT_ADDRESS = '{}:{}'.format(HUB_HOST, HUB_OUT_PORT)
+
+
+def _contains_float_outside(obj, limit: float) -> bool:
+    """
+    Checks whether ``obj`` is, or contains, a float which isn't strictly
+    between ``-limit`` and ``limit``. NaN never is.
+
+    :param obj: Deserialized JSON object.
+    :param limit: Magnitude which floats need to be less than.
+    :return: Whether any such float was found.
+    """
+    obj_type = type(obj)
+
+    if obj_type is float:
+        return not -limit < obj < limit
+
+    if obj_type is dict:
+        values = obj.values()
+    elif obj_type is list or obj_type is tuple:
+        values = obj
+    else:
+        return False
+
+    # Scalars are checked here rather than with a call each, since this runs
+    # for every dumpling.
+    for value in values:
+        value_type = type(value)
+
+        if value_type is float:
+            if not -limit < value < limit:
+                return True
+        elif value_type is dict or value_type is list or value_type is tuple:
+            if _contains_float_outside(value, limit):
+                return True
+
+    return False
+
+
+def _stdlib_json_dumps(obj, pretty: bool = False) -> str:
+    """
+    Serializes ``obj`` to a JSON string with :func:`json.dumps`, formatted the
+    same way as orjson formats it.
+
+    :param obj: Object to serialize.
+    :param pretty: Whether to sort the keys and indent by 2 spaces, rather
+        than serializing compactly.
+    :return: JSON string.
+    """
+    if pretty:
+        # Giving an indent already implies (',', ': ') separators.
+        return json.dumps(obj, ensure_ascii=False, sort_keys=True, indent=2)
+
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+# Use orjson for JSON if it's available. orjson doesn't accept everything the
+# json module does, so anything it rejects or would treat differently is
+# handed to the json module instead. That way dumplings look the same whether
+# or not orjson is installed.
+if orjson is None:
+    json_loads = json.loads
+    json_dumps = _stdlib_json_dumps
+else:
+    # orjson.loads() turns integers outside the 64-bit range into floats, so
+    # any float at least this big might have been an integer. (The float for
+    # -2 ** 63 - 1 rounds to -2 ** 63.)
+    _ORJSON_INT_LIMIT = float(2 ** 63)
+
+    # Types which orjson serializes but the json module doesn't are passed
+    # through so that they raise TypeError.
+    _ORJSON_DUMPS_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS |
+        orjson.OPT_PASSTHROUGH_DATACLASS |
+        orjson.OPT_PASSTHROUGH_DATETIME |
+        orjson.OPT_PASSTHROUGH_SUBCLASS
+    )
+
+    # orjson only supports 2-space indentation, so that's what both
+    # serializers use for pretty output.
+    _ORJSON_PRETTY_DUMPS_OPTIONS = (
+        _ORJSON_DUMPS_OPTIONS | orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+    )
+
+    def json_loads(s):
+        """
+        Deserializes the JSON ``s`` using orjson. JSON which orjson rejects
+        (such as ``NaN`` and ``Infinity``), or which orjson may have turned
+        integers wider than 64 bits into floats for, is deserialized again
+        with :func:`json.loads`.
 
-def configure_logging(log_level=logging.INFO, config_file=LOGGING_CONFIG_FILE):
+        :param s: JSON ``str`` or ``bytes``.
+        :return: Deserialized object.
+        """
+        try:
+            obj = orjson.loads(s)
+        except orjson.JSONDecodeError:
+            return json.loads(s)
+
+        if _contains_float_outside(obj, _ORJSON_INT_LIMIT):
+            return json.loads(s)
+
+        return obj
+
+    def json_dumps(obj, pretty=False):
+        """
+        Serializes ``obj`` to a JSON string using orjson. Objects which orjson
+        can't serialize (such as integers wider than 64 bits) and objects
+        containing ``NaN`` or ``Infinity`` (which orjson writes as ``null``)
+        are serialized with :func:`json.dumps` instead, in the same format.
+
+        :param obj: Object to serialize.
+        :param pretty: Whether to sort the keys and indent by 2 spaces, rather
+            than serializing compactly.
+        :return: JSON string.
+        """
+        try:
+            serialized = orjson.dumps(
+                obj,
+                option=(
+                    _ORJSON_PRETTY_DUMPS_OPTIONS if pretty
+                    else _ORJSON_DUMPS_OPTIONS
+                ),
+            )
+        except orjson.JSONEncodeError:
+            return _stdlib_json_dumps(obj, pretty)
+
+        if (b'null' in serialized and
+                _contains_float_outside(obj, float('inf'))):
+            return _stdlib_json_dumps(obj, pretty)
+
+        return serialized.decode('utf-8')
+
+# Whether configure_logging() has set up the logging.Formatter timestamps.
+_logging_formatter_configured = False
+
+
+def configure_logging(
+        log_level=logging.INFO,
+        config_file=LOGGING_CONFIG_FILE,
+        force=False,
+):
     """
     Configure logging. Configuration is retrieved from an external
     file (``data/logging.json`` in the netdumplings package), which can be
     overridden with ``config_file`` or with the `NETDUMPLINGS_LOGGING_CONFIG``
     environment variable.
 
+    The logging timestamp format is only set up on the first call (or when
+    ``force`` is ``True``). The logging config itself is applied every time.
+
     :param log_level: Log level to use. Defaults to ``'INFO'``.
     :param config_file: Path to the logging config file to use. Defaults to
         ``data/logging.json`` in the netdumplings package.
+    :param force: Set up the logging timestamp format even if it's already
+        been done.
     """
-    # Format timestamps in GMT, YYYY-MM-DDThh:mm:ss.sss
-    logging.Formatter.converter = time.gmtime
-    logging.Formatter.default_time_format = '%Y-%m-%dT%H:%M:%S'
-    logging.Formatter.default_msec_format = '%s.%03d'
+    global _logging_formatter_configured
 
-    use_basic_config = False
+    if force or not _logging_formatter_configured:
+        # Format timestamps in GMT, YYYY-MM-DDThh:mm:ss.sss
+        logging.Formatter.converter = time.gmtime
+        logging.Formatter.default_time_format = '%Y-%m-%dT%H:%M:%S'
+        logging.Formatter.default_msec_format = '%s.%03d'
+        _logging_formatter_configured = True
 
-    try:
-        config_file = os.environ['NETDUMPLINGS_LOGGING_CONFIG']
-    except KeyError:
-        pass
+    config_file = os.environ.get('NETDUMPLINGS_LOGGING_CONFIG', config_file)
 
-    if os.path.exists(config_file):
-        try:
-            with open(config_file) as logging_config_handler:
-                logging_config = json.load(logging_config_handler)
-
-            logging.config.dictConfig(logging_config)
-        except (IOError, json.decoder.JSONDecodeError) as e:
-            use_basic_config = True
-            print(
-                'error loading logging config: {}: {}'.format(config_file, e)
-            )
-    else:
-        use_basic_config = True
+    if not os.path.exists(config_file):
+        logging.basicConfig(level=log_level)
+        return
 
-    if use_basic_config:
+    try:
+        with open(config_file) as logging_config_handler:
+            logging.config.dictConfig(json.load(logging_config_handler))
+    except (IOError, json.decoder.JSONDecodeError) as e:
+        print('error loading logging config: {}: {}'.format(config_file, e))
         logging.basicConfig(level=log_level)
 
 
@@ -74,13 +245,13 @@ def validate_dumpling(dumpling_json):
     hub. Validation involves ensuring that it's valid JSON and that it includes
     a ``metadata.chef`` key.
 
-    :param dumpling_json: The dumpling JSON.
+    :param dumpling_json: The dumpling JSON (``str`` or ``bytes``).
     :raise: :class:`netdumplings.exceptions.InvalidDumpling` if the
         dumpling is invalid.
     :return: A dict created from the dumpling JSON.
     """
     try:
-        dumpling = json.loads(dumpling_json)
+        dumpling = json_loads(dumpling_json)
     except json.JSONDecodeError as e:
         raise InvalidDumpling("Could not interpret dumpling JSON")
 
@@ -90,3 +261,29 @@ def validate_dumpling(dumpling_json):
         raise InvalidDumpling("Could not determine chef name")
 
     return dumpling
+
+
+def batch_length(dumpling_jsons: List[str]) -> int:
+    """
+    Works out how many of the given JSON-serialized dumplings, taken from the
+    start of the list, fit into one batched websocket message of at most
+    ``HUB_MAX_BATCH_SIZE`` dumplings and ``HUB_MAX_BATCH_BYTES`` bytes. The
+    first dumpling always fits.
+
+    :param dumpling_jsons: JSON-serialized dumplings waiting to be sent.
+    :return: Number of dumplings to send in the next message.
+    """
+    # Start at -1 since there's one less newline than there are dumplings.
+    batch_bytes = -1
+
+    for index, dumpling_json in enumerate(
+            dumpling_jsons[:HUB_MAX_BATCH_SIZE]):
+        batch_bytes += 1 + (
+            len(dumpling_json) if dumpling_json.isascii()
+            else len(dumpling_json.encode('utf-8'))
+        )
+
+        if batch_bytes > HUB_MAX_BATCH_BYTES and index > 0:
+            return index
+
+    return min(len(dumpling_jsons), HUB_MAX_BATCH_SIZE)
@@ -1,14 +1,40 @@
-from .hub import hub_cli
-from .hubdetails import hubdetails_cli
-from .hubstatus import hubstatus_cli
-from .print import print_cli
-from .sniff import sniff_cli
-
-
-(
-    hub_cli,
-    hubdetails_cli,
-    hubstatus_cli,
-    print_cli,
-    sniff_cli,
-)
+import importlib
+
+# The commandline entry points are exported lazily (PEP 562) so that importing
+# netdumplings.console doesn't import click and every tool's dependencies.
+# Each entry maps an exported name to the (module, attribute) it comes from.
+_LAZY_EXPORTS = {
+    'hub_cli': ('netdumplings.console.hub', 'hub_cli'),
+    'hubdetails_cli': ('netdumplings.console.hubdetails', 'hubdetails_cli'),
+    'hubstatus_cli': ('netdumplings.console.hubstatus', 'hubstatus_cli'),
+    'print_cli': ('netdumplings.console.print', 'print_cli'),
+    'sniff_cli': ('netdumplings.console.sniff', 'sniff_cli'),
+}
+
+__all__ = [
+    'hub_cli',
+    'hubdetails_cli',
+    'hubstatus_cli',
+    'print_cli',
+    'sniff_cli',
+]
+
+
+def __getattr__(name):
+    try:
+        module_name, attr_name = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(
+            'module {!r} has no attribute {!r}'.format(__name__, name)
+        ) from None
+
+    value = getattr(importlib.import_module(module_name), attr_name)
+
+    # Cache the resolved value so __getattr__ is only hit once per name.
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
@@ -1,8 +1,6 @@
-import json
+import click
 
-import pygments
-import pygments.lexers
-import pygments.formatters
+from netdumplings._shared import HUB_OUT_ADDRESS, json_dumps
 
 
 CLICK_CONTEXT_SETTINGS = {
@@ -10,6 +8,50 @@ CLICK_CONTEXT_SETTINGS = {
     'help_option_names': ['--help'],
 }
 
+# ANSI escape codes for bold terminal text. These are the same codes that
+# termcolor.colored(text, attrs=['bold']) generates.
+ANSI_BOLD = '\x1b[1m'
+ANSI_RESET = '\x1b[0m'
+
+# Commandline options shared by the dumpling eater tools. click.option()
+# decorators can be applied to any number of commands.
+hub_option = click.option(
+    '--hub', '-h',
+    help='Address where nd-hub is sending dumplings from.',
+    metavar='HOST:PORT',
+    default=HUB_OUT_ADDRESS,
+    show_default=True,
+)
+
+color_option = click.option(
+    '--color / --no-color',
+    help='Print color output.',
+    default=True,
+    show_default=True,
+)
+
+
+def eater_name_option(default):
+    """
+    Creates the ``--eater-name`` commandline option for a dumpling eater tool.
+
+    :param default: Default eater name.
+    :return: A click option decorator.
+    """
+    return click.option(
+        '--eater-name', '-n',
+        help='Dumpling eater name for this tool when connecting to nd-hub.',
+        metavar='EATER_NAME',
+        default=default,
+        show_default=True,
+    )
+
+
+# The pygments lexer and formatter used to colorize dumplings. These are
+# created on first use by printable_dumpling() and then reused.
+_json_lexer = None
+_terminal_formatter = None
+
 
 def printable_dumpling(contents, colorize=True):
     """
@@ -20,18 +62,24 @@ def printable_dumpling(contents, colorize=True):
     :param colorize: Whether to colorize the dumpling string.
     :return: Pretty-printed string representing the dumpling contents.
     """
-    contents_printable = json.dumps(
-        contents,
-        sort_keys=True,
-        indent=4,
-        separators=(',', ': ')
-    )
+    global _json_lexer, _terminal_formatter
+
+    contents_printable = json_dumps(contents, pretty=True)
 
     if colorize:
+        # pygments is only needed for colorized output, and importing it is
+        # relatively slow, so defer it until it's needed.
+        import pygments
+
+        if _json_lexer is None:
+            import pygments.lexers
+            import pygments.formatters
+
+            _json_lexer = pygments.lexers.JsonLexer()
+            _terminal_formatter = pygments.formatters.TerminalFormatter()
+
         contents_printable = pygments.highlight(
-            contents_printable,
-            pygments.lexers.JsonLexer(),
-            pygments.formatters.TerminalFormatter(),
+            contents_printable, _json_lexer, _terminal_formatter,
         ).rstrip()
 
     return contents_printable
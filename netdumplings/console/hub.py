@@ -3,6 +3,7 @@ import sys
 import click
 
 import netdumplings
+from netdumplings._version import __version__
 from netdumplings.exceptions import NetDumplingsError
 from netdumplings._shared import (
     configure_logging, HUB_HOST, HUB_IN_PORT, HUB_OUT_PORT, HUB_STATUS_FREQ,
@@ -45,7 +46,7 @@ from netdumplings.console._shared import CLICK_CONTEXT_SETTINGS
     default=HUB_STATUS_FREQ,
     show_default=True,
 )
-@click.version_option(version=netdumplings.__version__)
+@click.version_option(version=__version__)
 def hub_cli(address, in_port, out_port, status_freq):
     """
     The dumpling hub.
@@ -1,15 +1,20 @@
+import sys
+
 import click
 
 import netdumplings
-from netdumplings._shared import HUB_HOST, HUB_OUT_PORT
+from netdumplings._version import __version__
 
-from netdumplings.console._shared import CLICK_CONTEXT_SETTINGS, printable_dumpling
+from netdumplings.console._shared import (
+    CLICK_CONTEXT_SETTINGS, color_option, eater_name_option, hub_option,
+    printable_dumpling,
+)
 
 
 PRINT_COLOR = False
 
 
-async def on_connect(hub_uri, websocket):
+def on_connect(hub_uri, websocket):
     """
     Called when the connection to ``nd-hub`` has been created.
 
@@ -21,19 +26,19 @@ async def on_connect(hub_uri, websocket):
     print('Waiting for a SystemStatus dumpling...')
 
 
-async def on_dumpling(dumpling):
+def on_dumpling(dumpling):
     """
     Called when a new dumpling is received from ``nd-hub``. Prints dumpling
     payload.
 
     :param dumpling: The received dumpling.
     """
-    print('\n{}\n'.format(
+    sys.stdout.write('\n{}\n\n'.format(
         printable_dumpling(dumpling.payload, colorize=PRINT_COLOR)
     ))
 
 
-async def on_connection_lost(e):
+def on_connection_lost(e):
     """
     Called when the ``nd-hub`` connection is lost.
 
@@ -47,27 +52,10 @@ async def on_connection_lost(e):
 @click.command(
     context_settings=CLICK_CONTEXT_SETTINGS,
 )
-@click.option(
-    '--hub', '-h',
-    help='Address where nd-hub is sending dumplings from.',
-    metavar='HOST:PORT',
-    default='{}:{}'.format(HUB_HOST, HUB_OUT_PORT),
-    show_default=True,
-)
-@click.option(
-    '--eater-name', '-n',
-    help='Dumpling eater name for this tool when connecting to nd-hub.',
-    metavar='EATER_NAME',
-    default='detailseater',
-    show_default=True,
-)
-@click.option(
-    '--color / --no-color',
-    help='Print color output.',
-    default=True,
-    show_default=True,
-)
-@click.version_option(version=netdumplings.__version__)
+@hub_option
+@eater_name_option('detailseater')
+@color_option
+@click.version_option(version=__version__)
 def hubdetails_cli(hub, eater_name, color):
     """
     A dumpling eater.
@@ -1,19 +1,57 @@
-import datetime
+import sys
+import time
 
 import click
 import colorama
-import termcolor
 
 import netdumplings
-from netdumplings._shared import HUB_HOST, HUB_OUT_PORT
+from netdumplings._version import __version__
 
-from netdumplings.console._shared import CLICK_CONTEXT_SETTINGS
+from netdumplings.console._shared import (
+    ANSI_BOLD, ANSI_RESET, CLICK_CONTEXT_SETTINGS, color_option,
+    eater_name_option, hub_option,
+)
 
 
 PRINT_COLOR = False
 
 
-async def on_connect(hub_uri, websocket):
+def _bold(value):
+    """
+    Returns ``value`` as a string wrapped in ANSI bold codes.
+    """
+    return f'{ANSI_BOLD}{value}{ANSI_RESET}'
+
+
+# Used to emphasize status values. Set to _bold by hubstatus_cli() when color
+# output is enabled so on_dumpling() doesn't need to check PRINT_COLOR.
+_emphasize = str
+
+
+# The (epoch second, formatted local time) most recently shown in a status
+# line. Status dumplings can arrive more than once a second, and the time is
+# only shown to the second.
+_status_time = (None, '')
+
+
+def _formatted_status_time():
+    """
+    Returns the current local time formatted for the status line. The
+    formatted string is reused until the current second changes.
+    """
+    global _status_time
+
+    now = int(time.time())
+
+    if now != _status_time[0]:
+        _status_time = (
+            now, time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now))
+        )
+
+    return _status_time[1]
+
+
+def on_connect(hub_uri, websocket):
     """
     Called when the connection to ``nd-hub`` has been created.
 
@@ -21,11 +59,13 @@ async def on_connect(hub_uri, websocket):
     :param websocket: The websocket object used for talking to ``nd-hub``
         (websockets.WebSocketClientProtocol).
     """
-    print('nd-hub status from {0}'.format(hub_uri))
-    print('Waiting for data... ', end='', flush=True)
+    sys.stdout.write(
+        'nd-hub status from {0}\nWaiting for data... '.format(hub_uri)
+    )
+    sys.stdout.flush()
 
 
-async def on_dumpling(dumpling):
+def on_dumpling(dumpling):
     """
     Called when a new dumpling is received from ``nd-hub``. Prints summary
     information about the current state of ``nd-hub``.
@@ -34,50 +74,30 @@ async def on_dumpling(dumpling):
     """
     payload = dumpling.payload
 
-    up_mins, up_secs = divmod(int(payload['server_uptime']), 60)
-    up_hrs, up_mins = divmod(up_mins, 60)
-    up_str = '{0:02d}:{1:02d}:{2:02d}'.format(up_hrs, up_mins, up_secs)
-
-    up_str = (
-        termcolor.colored(up_str, attrs=['bold']) if PRINT_COLOR else up_str
-    )
-
-    dumplings_in = (
-        termcolor.colored(payload['total_dumplings_in'], attrs=['bold'])
-        if PRINT_COLOR else payload['total_dumplings_in']
-    )
-
-    dumplings_out = (
-        termcolor.colored(payload['total_dumplings_out'], attrs=['bold'])
-        if PRINT_COLOR else payload['total_dumplings_out']
-    )
-
-    kitchens = (
-        termcolor.colored(payload['dumpling_kitchen_count'], attrs=['bold'])
-        if PRINT_COLOR else payload['dumpling_kitchen_count']
-    )
-
-    eaters = (
-        termcolor.colored(payload['dumpling_eater_count'], attrs=['bold'])
-        if PRINT_COLOR else payload['dumpling_eater_count']
+    uptime = int(payload['server_uptime'])
+    up_str = _emphasize(
+        f'{uptime // 3600:02d}:{uptime // 60 % 60:02d}:{uptime % 60:02d}'
     )
+    dumplings_in = _emphasize(payload['total_dumplings_in'])
+    dumplings_out = _emphasize(payload['total_dumplings_out'])
+    kitchens = _emphasize(payload['dumpling_kitchen_count'])
+    eaters = _emphasize(payload['dumpling_eater_count'])
 
+    # The leading \r returns to the start of the line so each status
+    # overwrites the last.
     status_msg = (
-        '\r{now}  uptime: {uptime}  dumplings in: {dumplings_in}  '
-        'out: {dumplings_out}  kitchens: {kitchens}  eaters: {eaters} '.format(
-            now=datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            dumplings_in=dumplings_in,
-            dumplings_out=dumplings_out,
-            uptime=up_str,
-            kitchens=kitchens,
-            eaters=eaters,
-        )
+        f'\r{_formatted_status_time()}  uptime: {up_str}  '
+        f'dumplings in: {dumplings_in}  out: {dumplings_out}  '
+        f'kitchens: {kitchens}  eaters: {eaters} '
     )
 
-    print(status_msg, end='', flush=True)
+    # One write and one flush per status line; print() would make separate
+    # writes for the message and its (empty) line ending.
+    sys.stdout.write(status_msg)
+    sys.stdout.flush()
 
 
-async def on_connection_lost(e):
+def on_connection_lost(e):
     """
     Called when the ``nd-hub`` connection is lost.
 
@@ -91,27 +111,10 @@ async def on_connection_lost(e):
 @click.command(
     context_settings=CLICK_CONTEXT_SETTINGS,
 )
-@click.option(
-    '--hub', '-h',
-    help='Address where nd-hub is sending dumplings from.',
-    metavar='HOST:PORT',
-    default='{}:{}'.format(HUB_HOST, HUB_OUT_PORT),
-    show_default=True,
-)
-@click.option(
-    '--eater-name', '-n',
-    help='Dumpling eater name for this tool when connecting to nd-hub.',
-    metavar='EATER_NAME',
-    default='statuseater',
-    show_default=True,
-)
-@click.option(
-    '--color / --no-color',
-    help='Print color output.',
-    default=True,
-    show_default=True,
-)
-@click.version_option(version=netdumplings.__version__)
+@hub_option
+@eater_name_option('statuseater')
+@color_option
+@click.version_option(version=__version__)
 def hubstatus_cli(hub, eater_name, color):
     """
     A dumpling eater.
@@ -120,8 +123,9 @@ def hubstatus_cli(hub, eater_name, color):
     information from any SystemStatusChef dumplings. This is a system
     monitoring dumpling eater which can be used to keep an eye on nd-hub.
     """
-    global PRINT_COLOR
+    global PRINT_COLOR, _emphasize
     PRINT_COLOR = color
+    _emphasize = _bold if color else str
 
     if PRINT_COLOR:
         colorama.init()  # Needed for Windows console.
@@ -1,14 +1,69 @@
-import datetime
+import functools
+import math
+import sys
+import time
 
 import click
 import colorama
-import termcolor
 
-import netdumplings
 from netdumplings import DumplingDriver, DumplingEater
-from netdumplings._shared import HUB_HOST, HUB_OUT_PORT
+from netdumplings._version import __version__
 
-from netdumplings.console._shared import CLICK_CONTEXT_SETTINGS, printable_dumpling
+from netdumplings.console._shared import (
+    ANSI_BOLD, ANSI_RESET, CLICK_CONTEXT_SETTINGS, color_option,
+    eater_name_option, hub_option, printable_dumpling,
+)
+
+
+# DumplingDriver members are singletons, so on_dumpling() can compare against
+# them by identity.
+PACKET_DRIVER = DumplingDriver.packet
+INTERVAL_DRIVER = DumplingDriver.interval
+
+
+@functools.lru_cache(maxsize=64)
+def _summary_suffix(driver, chef_name, kitchen, color):
+    """
+    Returns the part of a dumpling summary line which follows the timestamp.
+    Dumplings tend to come from a handful of chef/kitchen/driver combinations,
+    so the suffix is cached.
+
+    :param driver: The dumpling's :class:`DumplingDriver`.
+    :param chef_name: Name of the chef which made the dumpling.
+    :param kitchen: Name of the kitchen the dumpling came from.
+    :param color: Whether to show the chef and kitchen names in bold.
+    :return: The summary line suffix.
+    """
+    if color:
+        chef_name = f'{ANSI_BOLD}{chef_name}{ANSI_RESET}'
+        kitchen = f'{ANSI_BOLD}{kitchen}{ANSI_RESET}'
+
+    driver_label = 'packet' if driver is PACKET_DRIVER else 'interval'
+
+    return f' [{driver_label:8s}] {chef_name} from {kitchen}'
+
+
+def _isoformat_timestamp(timestamp):
+    """
+    Returns the local time ``timestamp`` in the same ISO 8601 format as
+    ``datetime.datetime.fromtimestamp(timestamp).isoformat()``, including
+    microseconds, without creating a datetime.
+
+    :param timestamp: Seconds since the epoch.
+    :return: ISO 8601 timestamp string.
+    """
+    fraction, seconds = math.modf(timestamp)
+    microseconds = round(fraction * 1e6)
+    if microseconds >= 1000000:
+        seconds += 1
+        microseconds -= 1000000
+
+    formatted = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(seconds))
+
+    return (
+        '{}.{:06d}'.format(formatted, microseconds) if microseconds
+        else formatted
+    )
 
 
 class PrinterEater(DumplingEater):
@@ -16,6 +71,16 @@ class PrinterEater(DumplingEater):
     A dumpling eater which displays dumpling information to the terminal as it
     arrives from ``nd-hub``.
     """
+    # DumplingEater instances still have a __dict__, but the attributes read
+    # for every dumpling in on_dumpling() live in slots.
+    __slots__ = (
+        '_kitchens',
+        '_interval_dumplings',
+        '_packet_dumplings',
+        '_payload',
+        '_color',
+    )
+
     def __init__(
             self,
             kitchens=None,
@@ -36,7 +101,7 @@ class PrinterEater(DumplingEater):
         if color:
             colorama.init()  # Needed for Windows console.
 
-    async def on_connect(self, hub_uri, websocket):
+    def on_connect(self, hub_uri, websocket):
         """
         Called when the connection to ``nd-hub`` has been created.
 
@@ -47,7 +112,7 @@ class PrinterEater(DumplingEater):
         print('Connected to nd-hub at {0}'.format(hub_uri))
         print('Waiting for dumplings...\n')
 
-    async def on_dumpling(self, dumpling):
+    def on_dumpling(self, dumpling):
         """
         Called when a new dumpling is received from ``nd-hub``. Prints the
         dumpling summary and payload.
@@ -57,8 +122,8 @@ class PrinterEater(DumplingEater):
         driver = dumpling.driver
 
         should_print_dumpling = (
-            (driver == DumplingDriver.interval and self._interval_dumplings) or
-            (driver == DumplingDriver.packet and self._packet_dumplings)
+            (driver is INTERVAL_DRIVER and self._interval_dumplings) or
+            (driver is PACKET_DRIVER and self._packet_dumplings)
         ) and (
             self._kitchens is None or dumpling.kitchen in self._kitchens
         )
@@ -66,35 +131,27 @@ class PrinterEater(DumplingEater):
         if not should_print_dumpling:
             return
 
-        dumpling_creation_time = (
-            datetime.datetime.fromtimestamp(dumpling.creation_time).isoformat()
-        )
+        dumpling_creation_time = _isoformat_timestamp(dumpling.creation_time)
 
-        dumpling_chef = (
-            termcolor.colored(dumpling.chef_name, attrs=['bold'])
-            if self._color else dumpling.chef_name
+        # The chef and kitchen names come from the dumpling JSON, so they're
+        # made into strings to be usable as _summary_suffix() cache keys.
+        summary = dumpling_creation_time + _summary_suffix(
+            driver, str(dumpling.chef_name), str(dumpling.kitchen), self._color
         )
 
-        dumpling_kitchen = (
-            termcolor.colored(dumpling.kitchen, attrs=['bold'])
-            if self._color else dumpling.kitchen
-        )
-
-        summary = '{} [{:8s}] {} from {}'.format(
-            dumpling_creation_time,
-            'packet' if driver == DumplingDriver.packet else 'interval',
-            dumpling_chef,
-            dumpling_kitchen,
-        )
-
-        print(summary)
-
+        # Write the summary and payload together so each dumpling is a single
+        # write to stdout.
         if self._payload:
-            print('\n{}\n'.format(
-                printable_dumpling(dumpling.payload, colorize=self._color)
-            ))
+            output = '{}\n\n{}\n\n'.format(
+                summary,
+                printable_dumpling(dumpling.payload, colorize=self._color),
+            )
+        else:
+            output = summary + '\n'
 
-    async def on_connection_lost(self, e):
+        sys.stdout.write(output)
+
+    def on_connection_lost(self, e):
         """
         Called when the ``nd-hub`` connection is lost.
 
@@ -108,13 +165,7 @@ class PrinterEater(DumplingEater):
 @click.command(
     context_settings=CLICK_CONTEXT_SETTINGS,
 )
-@click.option(
-    '--hub', '-h',
-    help='Address where nd-hub is sending dumplings from.',
-    metavar='HOST:PORT',
-    default='{}:{}'.format(HUB_HOST, HUB_OUT_PORT),
-    show_default=True,
-)
+@hub_option
 @click.option(
     '--chef', '-c',
     help='Restrict dumplings to those made by this chef. Multiple can be '
@@ -129,13 +180,7 @@ class PrinterEater(DumplingEater):
     metavar='KITCHEN_NAME',
     multiple=True,
 )
-@click.option(
-    '--eater-name', '-n',
-    help='Dumpling eater name for this tool when connecting to nd-hub.',
-    default='printereater',
-    metavar='EATER_NAME',
-    show_default=True,
-)
+@eater_name_option('printereater')
 @click.option(
     '--interval-dumplings / --no-interval-dumplings',
     help='Print interval dumplings.',
@@ -154,13 +199,8 @@ class PrinterEater(DumplingEater):
     default=True,
     show_default=True,
 )
-@click.option(
-    '--color / --no-color',
-    help='Print color output.',
-    default=True,
-    show_default=True,
-)
-@click.version_option(version=netdumplings.__version__)
+@color_option
+@click.version_option(version=__version__)
 def print_cli(hub, chef, kitchen, eater_name, interval_dumplings,
               packet_dumplings, payload, color):
     """
@@ -178,6 +218,7 @@ def print_cli(hub, chef, kitchen, eater_name, interval_dumplings,
         name=eater_name,
         hub=hub,
         chef_filter=chef if chef else None,
+        batch_dumplings=True,
     )
 
     eater.run()
@@ -1,4 +1,7 @@
 import asyncio
+from collections import defaultdict
+import functools
+import importlib
 import importlib.util
 import json
 import logging
@@ -6,19 +9,62 @@ import os.path
 import queue
 import sys
 import multiprocessing
+import multiprocessing.connection
 from typing import Dict, List, Optional, Union
 
 import click
 import websockets
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 import netdumplings
+from netdumplings._version import __version__
 from netdumplings._shared import (
-    configure_logging, ND_CLOSE_MSGS, HUB_HOST, HUB_IN_PORT,
+    batch_length, configure_logging, ND_CLOSE_CONN_CANCELLED, HUB_IN_ADDRESS,
+    HUB_MAX_BATCH_SIZE, KITCHEN_MAX_QUEUED_BATCHES,
+    KITCHEN_DUMPLING_BATCH_SIZE, KITCHEN_DUMPLING_BATCH_INTERVAL,
 )
 
 from netdumplings.console._shared import CLICK_CONTEXT_SETTINGS
 
 
+# Chef modules loaded from .py files, keyed by file path. (Chef modules
+# imported by name are already cached in sys.modules.) get_valid_chefs() fills
+# this in with the modules imported while looking for chefs.
+# The network sniffer process inherits it when it's forked, so it doesn't
+# execute the files again.
+_chef_file_modules = {}
+
+
+def _import_chef_module(chef_module: str, is_py_file: bool):
+    """
+    Imports a module containing dumpling chefs. Modules loaded from .py files
+    are only executed once.
+
+    :param chef_module: Python module name or path to a .py file.
+    :param is_py_file: Whether ``chef_module`` is the path to a .py file.
+    :return: The imported module.
+    """
+    if not is_py_file:
+        return importlib.import_module(chef_module)
+
+    try:
+        return _chef_file_modules[chef_module]
+    except KeyError:
+        pass
+
+    spec = importlib.util.spec_from_file_location('chefs', chef_module)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+
+    _chef_file_modules[chef_module] = mod
+
+    return mod
+
+
 def network_sniffer(
         kitchen_name: str,
         interface: str,
@@ -51,7 +97,8 @@ def network_sniffer(
     :param valid_chefs: Dict of module+chef combinations we plan on importing.
     :param sniffer_filter: PCAP-compliant sniffer filter.
     :param chef_poke_interval: Interval (in secs) to poke chefs.
-    :param dumpling_queue: Queue to pass to the kitchen to put dumplings on.
+    :param dumpling_queue: Queue to pass to the kitchen to put batches of
+        dumplings on.
     """
     configure_logging()
     log = logging.getLogger('netdumplings.console.sniff')
@@ -72,21 +119,15 @@ def network_sniffer(
         interface=interface,
         sniffer_filter=sniffer_filter,
         chef_poke_interval=chef_poke_interval,
+        dumpling_batch_size=KITCHEN_DUMPLING_BATCH_SIZE,
+        dumpling_batch_interval=KITCHEN_DUMPLING_BATCH_INTERVAL,
     )
 
     # Instantiate all the valid DumplingChef classes and register them with
     # the kitchen.
     for chef_module in valid_chefs:
         chef_class_names = valid_chefs[chef_module]
-
-        if os.path.isfile(chef_module):
-            spec = importlib.util.spec_from_file_location('chefs', chef_module)
-            mod = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(mod)
-        else:
-            # TODO: Investigate replacing __import__ with
-            #   importlib.import_module
-            mod = __import__(chef_module, fromlist=chef_class_names)
+        mod = _import_chef_module(chef_module, os.path.isfile(chef_module))
 
         for chef_class_name in chef_class_names:
             log.info("{0}: Registering {1}.{2} with kitchen".format(
@@ -105,11 +146,15 @@ async def send_dumplings_from_queue_to_hub(
         log: logging.Logger,
 ):
     """
-    Grabs dumplings from the dumpling queue and sends them to ``nd-hub``.
+    Grabs batches of dumplings from the dumpling queue and sends them to
+    ``nd-hub``.
+
+    Batches which have already queued up by the time a batch is sent are
+    included in the same websocket message, one dumpling per line.
 
     :param kitchen_name: The name of the kitchen.
     :param hub: The address where ``nd-hub`` is receiving dumplings.
-    :param dumpling_queue: Queue to grab dumplings from.
+    :param dumpling_queue: Queue to grab lists of dumplings from.
     :param kitchen_info: Dict describing the kitchen.
     :param log: Logger.
     """
@@ -120,7 +165,13 @@ async def send_dumplings_from_queue_to_hub(
     )
 
     try:
-        websocket = await websockets.client.connect(hub_ws)
+        # Dumplings are small and sent often, so per-message compression costs
+        # more CPU than the bandwidth it saves. The larger write limit lets a
+        # burst of dumpling batches be buffered for sending without every
+        # send() waiting for the buffer to drain.
+        websocket = await websockets.client.connect(
+            hub_ws, compression=None, write_limit=2 ** 20,
+        )
     except OSError as e:
         log.error(
             "{0}: There was a problem with the dumpling hub connection. "
@@ -128,33 +179,50 @@ async def send_dumplings_from_queue_to_hub(
         log.error("{0}: {1}".format(kitchen_name, e))
         return
 
+    loop = asyncio.get_running_loop()
+    get_dumpling = functools.partial(dumpling_queue.get, timeout=1)
+
     try:
-        # Register our kitchen information with the dumpling hub.
-        await websocket.send(json.dumps(kitchen_info))
+        # Register our kitchen information with the dumpling hub, and let it
+        # know to expect batched dumplings.
+        await websocket.send(
+            json.dumps(dict(kitchen_info, batch_dumplings=True))
+        )
+
+        # Dumplings taken off the queue which haven't been sent yet.
+        dumplings = []
 
         # Send dumplings to the hub when they come in from the chefs.
         while True:
-            # This is a bit hacky. We have a multiprocessing queue to get from,
-            # but we're running in a coroutine. The get() blocks, which I think
-            # is inferfering with websockets' ability to manage its heartbeat
-            # with the hub. This only seems to affect Windows. The workaround
-            # implemented here is to put a 1-second timeout on the queue get,
-            # ignore empty gets, and await asyncio.sleep() which appears to
-            # allow the run loop to continue (presumably allowing the keepalives
-            # to work).
-            try:
-                dumpling = dumpling_queue.get(timeout=1)
-                await websocket.send(dumpling)
-            except queue.Empty:
-                pass
-
-            await asyncio.sleep(0)
+            if not dumplings:
+                # The multiprocessing queue's get() blocks, so it's run in
+                # another thread. That leaves the event loop free to manage
+                # the websocket, including its keepalives with the hub. The
+                # timeout stops the thread from blocking for long once we're
+                # shutting down.
+                try:
+                    dumplings = await loop.run_in_executor(None, get_dumpling)
+                except queue.Empty:
+                    continue
+
+            # Add any other batches which are already waiting.
+            while len(dumplings) < HUB_MAX_BATCH_SIZE:
+                try:
+                    dumplings.extend(dumpling_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            # Send as many dumplings as fit into one message. The rest start
+            # the next message.
+            message_length = batch_length(dumplings)
+            await websocket.send('\n'.join(dumplings[:message_length]))
+            dumplings = dumplings[message_length:]
     except asyncio.CancelledError:
         log.warning(
             "{0}: Connection to dumpling hub cancelled; closing...".format(
                 kitchen_name))
         try:
-            await websocket.close(*ND_CLOSE_MSGS['conn_cancelled'])
+            await websocket.close(*ND_CLOSE_CONN_CANCELLED)
         except websockets.exceptions.InvalidState:
             pass
     except websockets.exceptions.ConnectionClosed as e:
@@ -181,13 +249,19 @@ def dumpling_emitter(
     :param kitchen_name: The name of the kitchen that the dumplings will be
         coming from.
     :param hub: The address where ``nd-hub`` is receiving dumplings.
-    :param dumpling_queue: Queue to get dumplings from.
+    :param dumpling_queue: Queue to get batches of dumplings from.
     :param kitchen_info: Information on the kitchen.
     """
     configure_logging()
     log = logging.getLogger('netdumplings.console.sniff')
     log.info("{0}: Starting dumpling emitter process".format(kitchen_name))
 
+    # Use uvloop's faster event loop for the websocket traffic if it's
+    # available. This process owns its own event loop, so this doesn't affect
+    # anything else.
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     try:
         asyncio.run(
             send_dumplings_from_queue_to_hub(
@@ -243,10 +317,16 @@ def get_valid_chefs(
         names and the values are a list of valid chef class names in each
         module.
     """
-    valid_chefs = {}
-    chef_info = netdumplings.DumplingKitchen.get_chefs_in_modules(chef_modules)
-    # TODO: chefs_seen could be a set.
-    chefs_seen = []
+    valid_chefs = defaultdict(list)
+    chef_info, modules = netdumplings.DumplingKitchen._import_chef_modules(
+        chef_modules
+    )
+    chefs_seen = set()
+
+    # A chefs_requested value of True means all chefs. Otherwise the requested
+    # chef names are put in a set for checking each chef class against.
+    all_chefs = chefs_requested is True
+    chef_names_requested = frozenset(() if all_chefs else chefs_requested)
 
     # Find all the valid chefs.
     for chef_module in chef_info:
@@ -256,40 +336,33 @@ def get_valid_chefs(
             continue
 
         chef_class_names = chef_info[chef_module]['chef_classes']
-        is_py_file = chef_info[chef_module]['is_py_file']
+        mod = modules[chef_module]
 
-        if is_py_file:
-            spec = importlib.util.spec_from_file_location('chefs', chef_module)
-            mod = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(mod)
-        else:
-            # TODO: Investigate replacing __import__ with
-            #   importlib.import_module
-            mod = __import__(chef_module, fromlist=chef_class_names)
+        # Keep hold of modules loaded from .py files so they don't need to be
+        # executed again when the chefs are instantiated.
+        if chef_info[chef_module]['is_py_file']:
+            _chef_file_modules[chef_module] = mod
 
         for chef_class_name in chef_class_names:
-            chefs_seen.append(chef_class_name)
+            chefs_seen.add(chef_class_name)
             klass = getattr(mod, chef_class_name)
             if not klass.assignable_to_kitchen:
                 log.warning("{0}: Chef {1} is marked as unassignable".format(
                     kitchen_name, chef_class_name))
                 continue
 
-            # A chefs_requested value of True means all chefs.
-            if chefs_requested is True or chef_class_name in chefs_requested:
-                try:
-                    valid_chefs[chef_module].append(chef_class_name)
-                except KeyError:
-                    valid_chefs[chef_module] = [chef_class_name]
+            if all_chefs or chef_class_name in chef_names_requested:
+                valid_chefs[chef_module].append(chef_class_name)
 
-    # Warn about any requested chefs which were not found.
-    if chefs_requested is not True:
+    # Warn about any requested chefs which were not found. This walks
+    # chefs_requested (rather than the set) to keep the requested order.
+    if not all_chefs:
         for chef_not_found in [chef for chef in chefs_requested
                                if chef not in chefs_seen]:
             log.warning("{0}: Chef {1} not found".format(
                 kitchen_name, chef_not_found))
 
-    return valid_chefs
+    return dict(valid_chefs)
 
 
 # -----------------------------------------------------------------------------
@@ -308,7 +381,7 @@ def get_valid_chefs(
     '--hub', '-h',
     help='Address where nd-hub is receiving dumplings.',
     metavar='HOST:PORT',
-    default='{}:{}'.format(HUB_HOST, HUB_IN_PORT),
+    default=HUB_IN_ADDRESS,
     show_default=True,
 )
 @click.option(
@@ -357,7 +430,7 @@ def get_valid_chefs(
     default=5.0,
     show_default=True,
 )
-@click.version_option(version=netdumplings.__version__)
+@click.version_option(version=__version__)
 def sniff_cli(kitchen_name, hub, interface, pkt_filter, chef_module, chef,
               chef_list, poke_interval):
     """
@@ -391,9 +464,24 @@ def sniff_cli(kitchen_name, hub, interface, pkt_filter, chef_module, chef,
     logger = logging.getLogger('netdumplings.console.sniff')
     logger.info("Initializing sniffer...")
 
+    # Fork the kitchen and emitter processes on Linux (newer Pythons default
+    # to forkserver) so they inherit the chef modules and scapy which have
+    # already been imported, rather than importing them all over again.
+    # Forking isn't safe on macOS, so it keeps its default of spawn. A context
+    # is used rather than setting the start method for the whole program.
+    if sys.platform.startswith('linux'):
+        mp_context = multiprocessing.get_context('fork')
+    else:
+        mp_context = multiprocessing.get_context()
+
     # A queue for passing dumplings from the sniffer kitchen to the
-    # dumpling-emitter process.
-    dumpling_emitter_queue = multiprocessing.Queue()
+    # dumpling-emitter process. It's bounded so the kitchen can't use up
+    # memory without limit if nd-hub is slow to take dumplings. The kitchen
+    # puts dumplings on the queue in batches, so the queue's size is a number
+    # of batches rather than dumplings.
+    dumpling_emitter_queue = mp_context.Queue(
+        maxsize=KITCHEN_MAX_QUEUED_BATCHES
+    )
 
     # Determine what chefs we'll be sending packets to.
     valid_chefs = get_valid_chefs(kitchen_name, chef_module, chef, logger)
@@ -414,7 +502,7 @@ def sniff_cli(kitchen_name, hub, interface, pkt_filter, chef_module, chef,
             )
 
     # Start the sniffer kitchen and dumpling-emitter processes.
-    sniffer_process = multiprocessing.Process(
+    sniffer_process = mp_context.Process(
         target=network_sniffer,
         args=(
             kitchen_name, interface, chef, chef_module, valid_chefs,
@@ -430,7 +518,7 @@ def sniff_cli(kitchen_name, hub, interface, pkt_filter, chef_module, chef,
         'poke_interval': poke_interval,
     }
 
-    dumpling_emitter_process = multiprocessing.Process(
+    dumpling_emitter_process = mp_context.Process(
         target=dumpling_emitter,
         args=(kitchen_name, hub, dumpling_emitter_queue, kitchen_info),
         daemon=True,
@@ -441,8 +529,11 @@ def sniff_cli(kitchen_name, hub, interface, pkt_filter, chef_module, chef,
 
     try:
         while True:
-            sniffer_process.join(0.5)
-            dumpling_emitter_process.join(0.5)
+            # Block until at least one of the processes has exited.
+            multiprocessing.connection.wait([
+                sniffer_process.sentinel,
+                dumpling_emitter_process.sentinel,
+            ])
 
             if not sniffer_process.is_alive():
                 logger.error(
@@ -5,6 +5,7 @@ from typing import Any, Optional, Union
 
 from .dumplingchef import DumplingChef
 from .exceptions import InvalidDumpling, InvalidDumplingPayload
+from ._shared import json_dumps, json_loads
 
 
 class DumplingDriver(Enum):
@@ -21,6 +22,11 @@ class DumplingDriver(Enum):
     interval = 2
 
 
+# Dumpling drivers keyed by their serialized names, and their repr strings.
+_DRIVERS_BY_NAME = {driver.name: driver for driver in DumplingDriver}
+_DRIVER_REPRS = {driver: str(driver) for driver in DumplingDriver}
+
+
 class Dumpling:
     """
     Represents a single Dumpling.
@@ -38,6 +44,8 @@ class Dumpling:
     * ``creation_time`` - when the dumpling was created (epoch milliseconds)
     * ``payload`` - the dumpling payload
 
+    These are the only attributes which can be set on a Dumpling.
+
     :param chef: The chef which created the dumpling payload (usually a
         :class:`DumplingChef` instance, but can be a string).
     :param driver: The event type that drove the dumpling to be created.
@@ -46,6 +54,12 @@ class Dumpling:
     :param payload: The dumpling payload information. Can be anything (usually
         a dict) which is JSON-serializable.
     """
+    # A Dumpling is created for every dumpling made by a kitchen or received
+    # by an eater, so it doesn't carry a per-instance __dict__.
+    __slots__ = (
+        'chef', 'chef_name', 'kitchen', 'driver', 'creation_time', 'payload',
+    )
+
     def __init__(
             self,
             *,
@@ -70,11 +84,9 @@ class Dumpling:
         self.payload = payload
 
     def __repr__(self):
-        if self.driver == DumplingDriver.packet:
-            driver = 'DumplingDriver.packet'
-        elif self.driver == DumplingDriver.interval:
-            driver = 'DumplingDriver.interval'
-        else:
+        try:
+            driver = _DRIVER_REPRS[self.driver]
+        except (KeyError, TypeError):
             driver = repr(self.driver)
 
         payload = (None if self.payload is None
@@ -102,13 +114,14 @@ class Dumpling:
         a dumpling which has already been JSON-serialized (presumably by a
         dumpling kitchen).
 
-        :param json_dumpling: JSON string to create the Dumpling from.
+        :param json_dumpling: JSON string (or bytes) to create the Dumpling
+            from.
         :return: A :class:`Dumpling` instance.
         :raise: :class:`InvalidDumpling` if ``json_dumpling`` could not be
             successfully converted into a Dumpling.
         """
         try:
-            dumpling_dict = json.loads(json_dumpling)
+            dumpling_dict = json_loads(json_dumpling)
         except (json.decoder.JSONDecodeError, TypeError, ValueError) as e:
             raise InvalidDumpling(
                 'Could not interpret dumpling JSON: {}'.format(e)
@@ -117,11 +130,13 @@ class Dumpling:
         metadata = dumpling_dict['metadata']
 
         try:
-            if metadata['driver'] == 'packet':
-                driver = DumplingDriver.packet
-            elif metadata['driver'] == 'interval':
-                driver = DumplingDriver.interval
-            else:
+            driver_name = metadata['driver']
+            driver = (
+                _DRIVERS_BY_NAME.get(driver_name)
+                if isinstance(driver_name, str) else None
+            )
+
+            if driver is None:
                 raise InvalidDumpling(
                     "Dumpling driver was not 'packet' or 'interval'"
                 )
@@ -159,7 +174,7 @@ class Dumpling:
         }
 
         try:
-            dumpling_serialized = json.dumps(dumpling)
+            dumpling_serialized = json_dumps(dumpling)
         except TypeError as e:
             raise InvalidDumplingPayload(
                 'Could not create dumpling: {}'.format(e)
@@ -66,9 +66,11 @@ class DumplingChef:
         :rtype: Anything which is JSON-serializable.
         :return: Dumpling payload.
         """
-        payload = "{0}: {1}".format(type(self).__name__, packet.summary())
-        self._logger.debug("{0}: Received packet: {1}",
-                           self.name, packet.summary())
+        summary = packet.summary()
+        payload = "{0}: {1}".format(type(self).__name__, summary)
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("{0}: Received packet: {1}".format(
+                self.name, summary))
 
         return payload
 
@@ -91,7 +93,8 @@ class DumplingChef:
         :rtype: Anything which is JSON-serializable.
         :return: Dumpling payload.
         """
-        self._logger.debug(
-            "{0}: Received interval_handler poke", self.name)
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug(
+                "{0}: Received interval_handler poke".format(self.name))
 
         return None
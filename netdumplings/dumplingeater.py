@@ -1,4 +1,5 @@
 import asyncio
+import inspect
 import json
 import logging
 import signal
@@ -8,7 +9,9 @@ import websockets
 from .dumpling import Dumpling
 from .exceptions import InvalidDumpling
 
-from ._shared import ND_CLOSE_MSGS, HUB_HOST, HUB_OUT_PORT
+from ._shared import (
+    ND_CLOSE_CONN_CANCELLED, ND_CLOSE_EATER_FULL, HUB_OUT_ADDRESS,
+)
 
 
 class DumplingEater:
@@ -17,7 +20,7 @@ class DumplingEater:
 
     Connects to ``nd-hub`` and listens for any dumplings made by the provided
     ``chef_filter`` (or all chefs if ``chef_filter`` is ``None``). Can be
-    given ``async`` callables for any of the following events:
+    given callables for any of the following events:
 
     ``on_connect(websocket_uri, websocket_obj)``
         invoked when the connection to ``nd-hub`` is made
@@ -28,7 +31,9 @@ class DumplingEater:
     ``on_connection_lost(e)``
         invoked when the connection to ``nd-hub`` is closed
 
-    **The above callables must be** ``async def`` **methods**.
+    The above callables can be ``async def`` coroutine functions or plain
+    functions. Handlers which never ``await`` anything can be plain functions,
+    which avoids creating a coroutine for every call.
 
     :param name: Name of the dumpling eater. Is ideally unique per eater.
     :param hub: Address where ``nd-hub`` is sending dumplings from.
@@ -41,21 +46,26 @@ class DumplingEater:
         dumpling as a Python dict.
     :param on_connection_lost: Called when connection to ``nd-hub`` is lost. Is
         passed the associated exception object.
+    :param batch_dumplings: Whether to ask ``nd-hub`` to batch up dumplings
+        which have queued up for this eater into a single websocket message.
+        Dumplings are still passed to ``on_dumpling`` one at a time.
     """
     def __init__(
             self,
             name: str = 'nameless_eater',
-            hub: str ='{}:{}'.format(HUB_HOST, HUB_OUT_PORT),
+            hub: str = HUB_OUT_ADDRESS,
             *,
             chef_filter: Optional[List[str]] = None,
             on_connect: Optional[Callable] = None,
             on_dumpling: Optional[Callable] = None,
-            on_connection_lost: Optional[Callable] = None) -> None:
+            on_connection_lost: Optional[Callable] = None,
+            batch_dumplings: bool = False) -> None:
 
         self.name = name
         self.chef_filter = chef_filter
         self.hub = hub
         self.hub_ws = "ws://{0}".format(hub)
+        self.batch_dumplings = batch_dumplings
 
         # Configure handlers. If we're not provided with handlers then we
         # fall back on the default handlers or the handlers provided by a
@@ -93,7 +103,8 @@ class DumplingEater:
             'chef_filter={}, '
             'on_connect={}, '
             'on_dumpling={}, '
-            'on_connection_lost={})'.format(
+            'on_connection_lost={}, '
+            'batch_dumplings={})'.format(
                 type(self).__name__,
                 repr(self.name),
                 repr(self.hub),
@@ -101,6 +112,7 @@ class DumplingEater:
                 handler_string(self.on_connect),
                 handler_string(self.on_dumpling),
                 handler_string(self.on_connection_lost),
+                repr(self.batch_dumplings),
             )
         )
 
@@ -124,44 +136,69 @@ class DumplingEater:
 
         try:
             # Announce ourselves to the dumpling hub.
-            await websocket.send(json.dumps({'eater_name': self.name}))
+            eater_info = {'eater_name': self.name}
+            if self.batch_dumplings:
+                eater_info['batch_dumplings'] = True
+
+            await websocket.send(json.dumps(eater_info))
 
             if self.on_connect:
-                await self.on_connect(self.hub_ws, websocket)
+                await self._call_handler(
+                    self.on_connect, self.hub_ws, websocket
+                )
 
             while True:
-                # Eat a single dumpling.
-                dumpling_json = await websocket.recv()
-
-                # Create a Dumpling from the JSON received over the websocket.
-                # Note that invalid dumplings will probably be stripped out by
-                # the hub already.
-                try:
-                    dumpling = Dumpling.from_json(dumpling_json)
-                except InvalidDumpling as e:
-                    self.logger.error("{0}: Invalid dumpling: {1}".format(
-                        self.name, e))
-                    continue
-
-                self.logger.debug("{0}: Received dumpling from {1}".format(
-                    self.name, dumpling.chef_name))
-
-                # Call the on_dumpling handler if this dumpling is from a
-                # chef that we've registered interest in.
-                if (self.chef_filter is None or
-                        dumpling.chef_name in self.chef_filter):
-                    self.logger.debug(
-                        "{0}: Calling dumpling handler {1}".format(
-                            self.name, self.on_dumpling))
-
-                    dumplings_eaten += 1
-                    await self.on_dumpling(dumpling)
-
-                # Stop eating dumplings if we've reached our threshold.
-                if dumpling_count is not None and \
-                        dumplings_eaten >= dumpling_count:
-                    await websocket.close(*ND_CLOSE_MSGS['eater_full'])
-                    break
+                message = await websocket.recv()
+
+                # A batched message holds newline-delimited dumplings. nd-hub
+                # makes sure the JSON for a single dumpling never contains a
+                # raw newline.
+                dumpling_jsons = (
+                    message.split('\n') if self.batch_dumplings else (message,)
+                )
+
+                # Eat each dumpling.
+                for dumpling_json in dumpling_jsons:
+                    # Create a Dumpling from the JSON received over the
+                    # websocket. Note that invalid dumplings will probably be
+                    # stripped out by the hub already.
+                    try:
+                        dumpling = Dumpling.from_json(dumpling_json)
+                    except InvalidDumpling as e:
+                        self.logger.error("{0}: Invalid dumpling: {1}".format(
+                            self.name, e))
+                        continue
+
+                    # Avoid formatting per-dumpling debug messages unless
+                    # they'll actually be logged.
+                    debug = self.logger.isEnabledFor(logging.DEBUG)
+
+                    if debug:
+                        self.logger.debug(
+                            "{0}: Received dumpling from {1}".format(
+                                self.name, dumpling.chef_name))
+
+                    # Call the on_dumpling handler if this dumpling is from a
+                    # chef that we've registered interest in.
+                    if (self.chef_filter is None or
+                            dumpling.chef_name in self.chef_filter):
+                        if debug:
+                            self.logger.debug(
+                                "{0}: Calling dumpling handler {1}".format(
+                                    self.name, self.on_dumpling))
+
+                        dumplings_eaten += 1
+
+                        # This is the hot path so _call_handler() is inlined.
+                        result = self.on_dumpling(dumpling)
+                        if inspect.isawaitable(result):
+                            await result
+
+                    # Stop eating dumplings if we've reached our threshold.
+                    if dumpling_count is not None and \
+                            dumplings_eaten >= dumpling_count:
+                        await websocket.close(*ND_CLOSE_EATER_FULL)
+                        return
         except asyncio.CancelledError:
             self.logger.warning(
                 f"\n{self.name}: Connection to dumpling hub cancelled; "
@@ -169,7 +206,7 @@ class DumplingEater:
             )
 
             try:
-                await websocket.close(*ND_CLOSE_MSGS['conn_cancelled'])
+                await websocket.close(*ND_CLOSE_CONN_CANCELLED)
             except websockets.exceptions.InvalidState:
                 pass
         except websockets.exceptions.ConnectionClosed as e:
@@ -178,7 +215,21 @@ class DumplingEater:
             )
 
             if self.on_connection_lost:
-                await self.on_connection_lost(e)
+                await self._call_handler(self.on_connection_lost, e)
+
+    @staticmethod
+    async def _call_handler(handler, *args):
+        """
+        Calls an event handler, awaiting the result if the handler is a
+        coroutine function.
+
+        :param handler: The handler to call.
+        :param args: Arguments to pass to the handler.
+        """
+        result = handler(*args)
+
+        if inspect.isawaitable(result):
+            await result
 
     @staticmethod
     def _interrupt_handler():
@@ -9,7 +9,8 @@ from .dumpling import Dumpling, DumplingDriver
 from .exceptions import InvalidDumpling, NetDumplingsError
 
 from ._shared import (
-    validate_dumpling, HUB_HOST, HUB_IN_PORT, HUB_OUT_PORT, HUB_STATUS_FREQ,
+    batch_length, json_dumps, json_loads, validate_dumpling,
+    HUB_HOST, HUB_IN_PORT, HUB_OUT_PORT, HUB_STATUS_FREQ, HUB_MAX_BATCH_SIZE,
 )
 
 
@@ -126,39 +127,75 @@ class DumplingHub:
         self._dumpling_kitchens[websocket] = kitchen
         kitchen_name = kitchen['metadata']['info_from_kitchen']['kitchen_name']
 
+        # Kitchens can send batches of newline-delimited dumplings in a
+        # single websocket message.
+        batch_dumplings = kitchen['metadata']['info_from_kitchen'].get(
+            'batch_dumplings', False
+        )
+
         self._logger.info(
             "Received dumpling kitchen connection from {0} at {1}:{2}".format(
                 kitchen_name, host, port))
 
         try:
             while True:
-                dumpling_json = await websocket.recv()
-
-                # Validate the dumpling.
-                try:
-                    dumpling = validate_dumpling(dumpling_json)
-                except InvalidDumpling as e:
-                    self._logger.error(
-                        "Received invalid dumpling: {0}; kitchen: {1}".format(
-                            e,
-                            json.dumps(
-                                kitchen['metadata']['info_from_kitchen']
-                            )
-                        ))
-                    continue
-
-                self._system_stats['dumplings_in'] += 1
-
-                chef = dumpling['metadata']['chef']
-                self._logger.debug(
-                    "Received {} dumpling from {} at {}:{}; {} bytes".format(
-                        chef, kitchen_name, host, port, len(dumpling_json)))
-
-                # Send this dumpling to all the eager dumpling eaters.
-                for eater in self._dumpling_eaters:
-                    await self._dumpling_eaters[eater]['queue'].put(
-                        dumpling_json
-                    )
+                message = await websocket.recv()
+
+                # Dumplings are passed on to eaters as text, so that dumplings
+                # from different kitchens can be batched together.
+                if isinstance(message, bytes):
+                    try:
+                        message = message.decode('utf-8')
+                    except UnicodeDecodeError as e:
+                        self._logger.error(
+                            "Received undecodable dumpling message: {0}; "
+                            "kitchen: {1}".format(
+                                e,
+                                json.dumps(
+                                    kitchen['metadata']['info_from_kitchen']
+                                )
+                            ))
+                        continue
+
+                dumpling_jsons = (
+                    message.split('\n') if batch_dumplings else (message,)
+                )
+
+                for dumpling_json in dumpling_jsons:
+                    # Validate the dumpling.
+                    try:
+                        dumpling = validate_dumpling(dumpling_json)
+                    except InvalidDumpling as e:
+                        self._logger.error(
+                            "Received invalid dumpling: {0}; "
+                            "kitchen: {1}".format(
+                                e,
+                                json.dumps(
+                                    kitchen['metadata']['info_from_kitchen']
+                                )
+                            ))
+                        continue
+
+                    # Dumplings are batched for eaters one per line, so a
+                    # dumpling with raw newlines in it (such as indented JSON
+                    # from a kitchen which doesn't batch) is made compact.
+                    if '\n' in dumpling_json:
+                        dumpling_json = json_dumps(dumpling)
+
+                    self._system_stats['dumplings_in'] += 1
+
+                    if self._logger.isEnabledFor(logging.DEBUG):
+                        self._logger.debug(
+                            "Received {} dumpling from {} at {}:{}; {} "
+                            "bytes".format(
+                                dumpling['metadata']['chef'], kitchen_name,
+                                host, port, len(dumpling_json)))
+
+                    # Send this dumpling to all the eager dumpling eaters.
+                    for eater in self._dumpling_eaters:
+                        await self._dumpling_eaters[eater]['queue'].put(
+                            dumpling_json
+                        )
         except ConnectionClosed as e:
             self._logger.info(
                 "Dumpling kitchen {0} connection closed: {1}".format(
@@ -199,23 +236,60 @@ class DumplingHub:
             "Received dumpling eater connection from {0} at {1}:{2}".format(
                 eater_name, host, port))
 
+        # Eaters can ask for dumplings to be batched, in which case all the
+        # dumplings waiting in the eater's queue are sent as a single
+        # newline-delimited websocket message.
+        batch_dumplings = eater['metadata']['info_from_eater'].get(
+            'batch_dumplings', False
+        )
+
         # Each dumpling eater has their own queue.  These queues receive all
         # the fresh new dumplings received by each instance of the
         # _grab_dumplings coroutine.
         dumpling_queue = eater['queue']
 
+        # Dumplings taken off the queue which haven't been sent yet.
+        dumplings = []
+
         try:
             while True:
-                dumpling = await dumpling_queue.get()
-                dumpling_obj = json.loads(dumpling)
-                chef = dumpling_obj['metadata']['chef']
-
-                self._logger.debug(
-                    "Sending {0} dumpling to {1} at {2}:{3}; {4} bytes".format(
-                        chef, eater_name, host, port, len(dumpling)))
-
-                await websocket.send(dumpling)
-                self._system_stats['dumplings_out'] += 1
+                if not dumplings:
+                    dumplings = [await dumpling_queue.get()]
+
+                if batch_dumplings:
+                    # Include any dumplings which were queued up while we were
+                    # waiting on the previous send.
+                    while len(dumplings) < HUB_MAX_BATCH_SIZE:
+                        try:
+                            dumplings.append(dumpling_queue.get_nowait())
+                        except asyncio.QueueEmpty:
+                            break
+
+                    # Send as many dumplings as fit into one message. The rest
+                    # start the next message.
+                    message_length = batch_length(dumplings)
+                else:
+                    message_length = 1
+
+                message_dumplings = dumplings[:message_length]
+                dumplings = dumplings[message_length:]
+
+                # Dumplings on the queue have already been validated, so the
+                # only reason to look inside one is to log its chef name.
+                if self._logger.isEnabledFor(logging.DEBUG):
+                    for dumpling in message_dumplings:
+                        chef = json_loads(dumpling)['metadata']['chef']
+
+                        self._logger.debug(
+                            "Sending {0} dumpling to {1} at {2}:{3}; {4} "
+                            "bytes".format(
+                                chef, eater_name, host, port, len(dumpling)))
+
+                await websocket.send(
+                    '\n'.join(message_dumplings) if batch_dumplings
+                    else message_dumplings[0]
+                )
+                self._system_stats['dumplings_out'] += len(message_dumplings)
         except ConnectionClosed as e:
             self._logger.info(
                 "Dumpling eater {0} connection closed: {1}".format(
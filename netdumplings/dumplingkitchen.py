@@ -5,10 +5,11 @@ import logging
 import multiprocessing
 import os
 import os.path
+import queue
 import sys
-from threading import Thread
+from threading import Condition, Lock, Thread
 from time import sleep
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from scapy.all import sniff
 from scapy.error import Scapy_Exception
@@ -39,7 +40,17 @@ class DumplingKitchen:
     involvement in that dumpling's life cycle is complete. It's the
     responsibility of the thing instantiating the kitchen to provide the queue
     and to then pull dumplings off the queue and send them on to the dumpling
-    hub.
+    hub. If the queue is bounded and full then new dumplings are dropped, so
+    that a slow consumer never holds up the sniffing of packets.
+
+    If ``dumpling_batch_size`` is set then the kitchen puts lists of
+    JSON-serialized dumplings on the queue rather than one dumpling at a time.
+    A batch is put on the queue once it's full or ``dumpling_batch_interval``
+    seconds after its first dumpling was made, whichever comes first. This
+    saves a queue put (and its locking and pickling) per dumpling when
+    dumplings are being made quickly. Batches are put on the queue in the
+    order their dumplings were made. A bounded queue's size is then a number
+    of batches, each holding anywhere from one dumpling to a full batch.
 
     Which network packets are sniffed can be controlled with a PCAP-style
     packer filter.
@@ -51,6 +62,10 @@ class DumplingKitchen:
         all packets).
     :param chef_poke_interval: Frequency (in secs) to call all registered chef
         poke handlers. ``None`` disables poking.
+    :param dumpling_batch_size: Maximum number of dumplings to put on the
+        queue at once. ``None`` puts dumplings on the queue one at a time.
+    :param dumpling_batch_interval: Maximum time (in secs) a dumpling will
+        wait in a batch before the batch is put on the queue.
     """
     def __init__(
             self,
@@ -59,14 +74,28 @@ class DumplingKitchen:
             interface: str = 'all',
             sniffer_filter: str = 'tcp',
             chef_poke_interval: int = 5,
+            dumpling_batch_size: Optional[int] = None,
+            dumpling_batch_interval: float = 0.005,
     ) -> None:
         self.name = name
         self.interface = interface
         self.filter = sniffer_filter
         self.chef_poke_interval = chef_poke_interval
         self.dumpling_queue = dumpling_queue
+        self.dumpling_batch_size = dumpling_batch_size
+        self.dumpling_batch_interval = dumpling_batch_interval
 
         self._chefs = []
+        self._dumplings_dropped = 0
+
+        # Dumplings waiting to be put on the queue as a batch. Dumplings are
+        # made by both the sniffer and the chef poker threads, and the batch
+        # is also flushed by its own thread, so it's guarded by a lock. The
+        # flushing thread waits on the condition until a new batch gets its
+        # first dumpling.
+        self._dumpling_batch = []
+        self._dumpling_batch_lock = Lock()
+        self._dumpling_batch_started = Condition(self._dumpling_batch_lock)
         self._logger = logging.getLogger(__name__)
 
     def __repr__(self):
@@ -76,13 +105,17 @@ class DumplingKitchen:
             'name={}, '
             'interface={}, '
             'sniffer_filter={}, '
-            'chef_poke_interval={})'.format(
+            'chef_poke_interval={}, '
+            'dumpling_batch_size={}, '
+            'dumpling_batch_interval={})'.format(
                 type(self).__name__,
                 repr(self.dumpling_queue),
                 repr(self.name),
                 repr(self.interface),
                 repr(self.filter),
                 repr(self.chef_poke_interval),
+                repr(self.dumpling_batch_size),
+                repr(self.dumpling_batch_interval),
             )
         )
 
@@ -94,7 +127,7 @@ class DumplingKitchen:
     ):
         """
         Creates a dumpling, JSON-serializes it, and puts it on the dumpling
-        queue.
+        queue (or adds it to the current batch if batching is enabled).
 
         :param chef: The chef which provided the dumpling payload.
         :param payload: The dumpling payload.
@@ -102,10 +135,99 @@ class DumplingKitchen:
         """
         dumpling = Dumpling(chef=chef, payload=payload, driver=driver)
         dumpling_json = dumpling.to_json()
-        self.dumpling_queue.put(dumpling_json)
-        self._logger.debug("{0}: Put dumpling on queue, {1} bytes".format(
-            self.name, len(dumpling_json)
-        ))
+
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("{0}: Made dumpling, {1} bytes".format(
+                self.name, len(dumpling_json)
+            ))
+
+        with self._dumpling_batch_lock:
+            if self.dumpling_batch_size is None:
+                self._put_on_queue(dumpling_json, 1)
+                return
+
+            self._dumpling_batch.append(dumpling_json)
+
+            if len(self._dumpling_batch) == 1:
+                self._dumpling_batch_started.notify()
+
+            if len(self._dumpling_batch) == self.dumpling_batch_size:
+                self._put_on_queue(
+                    self._dumpling_batch, self.dumpling_batch_size
+                )
+                self._dumpling_batch = []
+
+    def _put_on_queue(self, item, dumpling_count: int):
+        """
+        Puts a dumpling or a batch of dumplings on the dumpling queue. The
+        item is dropped if the queue is full.
+
+        This must be called with ``_dumpling_batch_lock`` held, so that the
+        sniffer, chef poker, and batch flushing threads put items on the
+        queue in order and don't lose drop counts. ``put_nowait()`` doesn't
+        wait for the item to be pickled, so the lock isn't held for long.
+
+        :param item: JSON-serialized dumpling, or list of them.
+        :param dumpling_count: Number of dumplings in ``item``.
+        """
+        try:
+            self.dumpling_queue.put_nowait(item)
+        except queue.Full:
+            self._dumplings_dropped += dumpling_count
+
+            # Only log roughly one in every 1000 drops so we don't add to the
+            # load while the queue's consumer is falling behind.
+            if (self._dumplings_dropped - 1) % 1000 < dumpling_count:
+                self._logger.warning(
+                    "{0}: Dumpling queue is full{1}; {2} dumpling(s) "
+                    "dropped".format(
+                        self.name,
+                        '' if self.dumpling_batch_size is None
+                        else ' of batches',
+                        self._dumplings_dropped,
+                    ))
+
+    def _flush_dumpling_batch(self):
+        """
+        Puts the current batch of dumplings (if any) on the dumpling queue.
+        """
+        with self._dumpling_batch_lock:
+            if self._dumpling_batch:
+                self._put_on_queue(
+                    self._dumpling_batch, len(self._dumpling_batch)
+                )
+                self._dumpling_batch = []
+
+    def _flush_dumpling_batches(self, interval: float):
+        """
+        Flushes each batch of dumplings ``interval`` seconds after its first
+        dumpling was made, unless it filled up and was put on the queue
+        before then. This stops dumplings from waiting in a partial batch
+        when they're being made slowly. Nothing happens while no dumplings
+        are being made.
+
+        This is intended to be run in a separate thread.
+
+        :param interval: Maximum time (in secs) a batch can wait to be
+            flushed.
+        """
+        while True:
+            with self._dumpling_batch_started:
+                self._dumpling_batch_started.wait_for(
+                    lambda: self._dumpling_batch
+                )
+
+                batch = self._dumpling_batch
+
+                # Waking up early means a new batch was started after this
+                # one filled up, so go and wait on the new batch instead.
+                if self._dumpling_batch_started.wait_for(
+                        lambda: self._dumpling_batch is not batch,
+                        timeout=interval):
+                    continue
+
+                self._put_on_queue(batch, len(batch))
+                self._dumpling_batch = []
 
     def _process_packet(self, packet: scapy.packet.Raw):
         """
@@ -186,9 +308,23 @@ class DumplingKitchen:
           the module
         * ``"import_error"`` - an error string describing a problem encountered
           while finding dumpling chefs in the module (``False`` if no errors)
+        * ``"is_py_file"`` - whether the module was loaded from a .py file
 
         :return: Information on chefs found in the give modules.
         """
+        return DumplingKitchen._import_chef_modules(chef_modules)[0]
+
+    @staticmethod
+    def _import_chef_modules(
+            chef_modules: Optional[List[str]] = None) -> Tuple[Dict, Dict]:
+        """
+        Does the work for :meth:`get_chefs_in_modules`.
+
+        Also returns the imported modules, keyed by entry in ``chef_modules``,
+        so that nd-sniff doesn't need to import them again.
+
+        :return: A tuple of the chef information and the imported modules.
+        """
         # Allow for a chef module to be relative to the current working
         # directory (wherever the script calling this method is being run
         # from). There's potential for this to result in unexpected behaviour
@@ -196,6 +332,7 @@ class DumplingKitchen:
         sys.path.append(os.getcwd())
 
         chef_info = {}
+        modules = {}
 
         for chef_module in chef_modules:
             is_py_file = True if os.path.isfile(chef_module) else False
@@ -227,6 +364,7 @@ class DumplingKitchen:
                     chef_info[chef_module]['import_error'] = str(e)
                     continue
 
+            modules[chef_module] = module
             chef_classes = inspect.getmembers(module, inspect.isclass)
 
             for chef_class in chef_classes:
@@ -238,7 +376,7 @@ class DumplingKitchen:
                         chef_class[0]
                     )
 
-        return chef_info
+        return chef_info, modules
 
     def register_chef(self, chef: DumplingChef):
         """
@@ -276,6 +414,16 @@ class DumplingKitchen:
         else:
             self._logger.info(f"{self.name}: Interval poker thread disabled")
 
+        # Start the dumpling batch flushing thread.
+        if self.dumpling_batch_size is not None:
+            batch_flusher = Thread(
+                target=self._flush_dumpling_batches,
+                kwargs={'interval': self.dumpling_batch_interval},
+                daemon=True,
+            )
+
+            batch_flusher.start()
+
         # Start the sniffer.
         self._logger.info(f"{self.name}: Sniffing started")
 
@@ -298,3 +446,7 @@ class DumplingKitchen:
                 self._logger.error(str(e))
             else:
                 raise
+        finally:
+            # Don't leave the last few dumplings behind in a partial batch.
+            if self.dumpling_batch_size is not None:
+                self._flush_dumpling_batch()
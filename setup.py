@@ -22,7 +22,6 @@ install_requires = [
     'colorama',
     'pygments',
     'scapy~=2.4.3',
-    'termcolor',
     'websockets~=8.1.0',
 ]
 
@@ -36,6 +35,12 @@ tests_require = [
 ]
 
 extras_require = {
+    'orjson': [
+        'orjson',
+    ],
+    'uvloop': [
+        'uvloop; sys_platform != "win32"',
+    ],
     'dev': [
         'flake8',
         'mypy',
@@ -0,0 +1,57 @@
+import json
+
+from netdumplings.console._shared import printable_dumpling
+
+
+class TestPrintableDumpling:
+    """
+    Test the printable_dumpling() helper.
+    """
+    def test_printable_dumpling(self):
+        """
+        Test that the printable dumpling is sorted, pretty-printed JSON which
+        represents the original contents.
+        """
+        contents = {'b': 1, 'a': [1, 2, {'c': None}]}
+
+        printable = printable_dumpling(contents, colorize=False)
+
+        assert json.loads(printable) == contents
+        assert printable.index('"a"') < printable.index('"b"')
+        assert '\n' in printable
+
+    def test_printable_dumpling_colorized(self):
+        """
+        Test that colorized output includes terminal escape codes.
+        """
+        printable = printable_dumpling({'a': 1}, colorize=True)
+
+        assert '\x1b[' in printable
+
+    def test_printable_dumpling_indent(self):
+        """
+        Test that the printable dumpling uses 2-space indentation.
+        """
+        printable = printable_dumpling({'a': {'b': 1}}, colorize=False)
+
+        assert printable == '{\n  "a": {\n    "b": 1\n  }\n}'
+
+    def test_printable_dumpling_big_int(self):
+        """
+        Test that integers wider than 64 bits are printed exactly.
+        """
+        printable = printable_dumpling({'a': 2 ** 70}, colorize=False)
+
+        assert printable == '{\n  "a": 1180591620717411303424\n}'
+
+    def test_printable_dumpling_non_finite(self):
+        """
+        Test that NaN and Infinity are printed as themselves, not as null.
+        """
+        printable = printable_dumpling(
+            {'a': float('nan'), 'b': float('inf'), 'c': None}, colorize=False,
+        )
+
+        assert printable == (
+            '{\n  "a": NaN,\n  "b": Infinity,\n  "c": null\n}'
+        )
@@ -40,4 +40,5 @@ class TestHubStatus:
         )
 
         assert hubstatus.PRINT_COLOR is False
+        assert hubstatus._emphasize is str
         mock_status_eater.run.assert_called_once_with()
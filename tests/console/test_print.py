@@ -1,6 +1,12 @@
+import datetime
+
 import click.testing
+import pytest
 
-from netdumplings.console.print import print_cli
+from netdumplings import Dumpling, DumplingDriver
+from netdumplings.console.print import (
+    PrinterEater, _isoformat_timestamp, _summary_suffix, print_cli,
+)
 
 
 class TestPrint:
@@ -52,6 +58,63 @@ class TestPrint:
             name=eater_name,
             hub=hub,
             chef_filter=chefs,
+            batch_dumplings=True,
         )
 
         mock_eater_instance.run.assert_called_once_with()
+
+
+class TestSummarySuffix:
+    """
+    Test the dumpling summary line suffix.
+    """
+    def test_summary_suffix(self):
+        """
+        Test the plain and colorized suffixes.
+        """
+        assert _summary_suffix(
+            DumplingDriver.packet, 'TestChef', 'TestKitchen', False
+        ) == ' [packet  ] TestChef from TestKitchen'
+
+        assert _summary_suffix(
+            DumplingDriver.interval, 'TestChef', 'TestKitchen', True
+        ) == (
+            ' [interval] \x1b[1mTestChef\x1b[0m from \x1b[1mTestKitchen\x1b[0m'
+        )
+
+    def test_unhashable_chef_and_kitchen(self, capsys):
+        """
+        Test that a dumpling with a non-string chef and kitchen name is still
+        summarized.
+        """
+        dumpling = Dumpling(
+            chef=['TestChef'], driver=DumplingDriver.packet, payload=None
+        )
+        dumpling.kitchen = {'name': 'TestKitchen'}
+
+        eater = PrinterEater(payload=False, color=False)
+        eater.on_dumpling(dumpling)
+
+        assert capsys.readouterr().out.endswith(
+            " [packet  ] ['TestChef'] from {'name': 'TestKitchen'}\n"
+        )
+
+
+class TestIsoformatTimestamp:
+    """
+    Test the dumpling creation time formatting.
+    """
+    @pytest.mark.parametrize('timestamp', [
+        1500000000,
+        1500000000.0,
+        1500000000.123456,
+        1500000000.5,
+        1500000000.9999996,
+    ])
+    def test_isoformat_timestamp(self, timestamp):
+        """
+        Test that timestamps are formatted like datetime.isoformat().
+        """
+        assert _isoformat_timestamp(timestamp) == (
+            datetime.datetime.fromtimestamp(timestamp).isoformat()
+        )
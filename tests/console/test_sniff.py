@@ -1,17 +1,22 @@
 import asyncio
-import builtins
+import importlib
 import importlib.util
 import json
 import logging
+import queue
 import types
 
 import asynctest
 import click.testing
 import pytest
 
+from netdumplings._shared import (
+    HUB_MAX_BATCH_SIZE, KITCHEN_DUMPLING_BATCH_SIZE,
+    KITCHEN_DUMPLING_BATCH_INTERVAL,
+)
 from netdumplings.console.sniff import (
     sniff_cli, get_valid_chefs, network_sniffer, dumpling_emitter,
-    send_dumplings_from_queue_to_hub,
+    send_dumplings_from_queue_to_hub, _chef_file_modules,
 )
 
 
@@ -27,15 +32,16 @@ class TestSniffCLI:
         mock_dumpling_emitter_process = mocker.Mock()
         mock_dumpling_emitter_process.is_alive.return_value = True
 
-        mock_queue = mocker.patch('multiprocessing.Queue')
+        mock_get_context = mocker.patch('multiprocessing.get_context')
+        mock_queue = mock_get_context.return_value.Queue
         mock_configure_logging = mocker.patch(
             'netdumplings.console.sniff.configure_logging'
         )
-        mocker.patch('netdumplings.console.sniff.sleep')
-        mock_process = mocker.patch(
-            'multiprocessing.Process',
-            side_effect=[mock_sniffer_process, mock_dumpling_emitter_process],
-        )
+        mocker.patch('multiprocessing.connection.wait')
+        mock_process = mock_get_context.return_value.Process
+        mock_process.side_effect = [
+            mock_sniffer_process, mock_dumpling_emitter_process,
+        ]
 
         runner = click.testing.CliRunner()
         result = runner.invoke(
@@ -167,19 +173,19 @@ class TestSniffNetworkSniffer:
            dumpling queue.
          - The kitchen's run() method is called.
         """
-        # network_sniffer() uses the __import__ builtin to import chefs, so we
-        # need to patch that.
-        builtin_import = builtins.__import__
+        # network_sniffer() uses importlib.import_module() to import chefs,
+        # so we need to patch that.
+        import_module = importlib.import_module
         chef_class_callable = mocker.Mock()
 
         def import_side_effect(*args, **kwargs):
             if args[0] == 'chefmodule':
                 return types.SimpleNamespace(ChefName=chef_class_callable)
 
-            return builtin_import(*args, **kwargs)
+            return import_module(*args, **kwargs)
 
         mocker.patch.object(
-            builtins, '__import__', side_effect=import_side_effect
+            importlib, 'import_module', side_effect=import_side_effect
         )
 
         mock_dumpling_kitchen = mocker.patch('netdumplings.DumplingKitchen')
@@ -205,6 +211,8 @@ class TestSniffNetworkSniffer:
             sniffer_filter=sniffer_filter,
             chef_poke_interval=chef_poke_interval,
             dumpling_queue=dumpling_queue,
+            dumpling_batch_size=KITCHEN_DUMPLING_BATCH_SIZE,
+            dumpling_batch_interval=KITCHEN_DUMPLING_BATCH_INTERVAL,
         )
 
         mock_dumpling_kitchen.return_value.run.assert_called_once()
@@ -216,12 +224,13 @@ class TestSniffNetworkSniffer:
     def test_network_sniffer_with_module_and_file_chefs(self, mocker):
         """
         Test calling network_sniffer() with one valid chef from a module and
-        another valid chef from a file. We just check that both __import__
-        and importlib.util.spec_from_file_location get called once each.
+        another valid chef from a file. We just check that both
+        importlib.import_module and importlib.util.spec_from_file_location get
+        called once each.
         """
-        # network_sniffer() uses the __import__ builtin to import chefs, so we
-        # need to patch that.
-        builtin_import = builtins.__import__
+        # network_sniffer() uses importlib.import_module() to import chefs,
+        # so we need to patch that.
+        import_module = importlib.import_module
         module_chef_callable = mocker.Mock()
         file_chef_callable = mocker.Mock()
 
@@ -231,10 +240,10 @@ class TestSniffNetworkSniffer:
                     ChefNameFromModule=module_chef_callable
                 )
 
-            return builtin_import(*args, **kwargs)
+            return import_module(*args, **kwargs)
 
         mocker.patch.object(
-            builtins, '__import__', side_effect=import_side_effect
+            importlib, 'import_module', side_effect=import_side_effect
         )
 
         mocker.patch.object(
@@ -246,6 +255,9 @@ class TestSniffNetworkSniffer:
         )
 
         mocker.patch.object(importlib.util, 'spec_from_file_location')
+        mocker.patch.dict(
+            'netdumplings.console.sniff._chef_file_modules', clear=True
+        )
 
         kitchen_name = 'test_kitchen'
         interface = 'test_interface'
@@ -270,6 +282,38 @@ class TestSniffNetworkSniffer:
         assert module_chef_callable.call_count == 1
         assert file_chef_callable.call_count == 1
 
+    def test_network_sniffer_reuses_file_chefs(self, mocker):
+        """
+        Test that a chef file which has already been loaded (by
+        get_valid_chefs() in the parent process) isn't executed again by
+        network_sniffer().
+        """
+        file_chef_callable = mocker.Mock()
+        chef_file = 'tests/data/chefs_in_a_file.py'
+
+        chef_file_module = types.SimpleNamespace(
+            ChefNameFromFile=file_chef_callable
+        )
+
+        mocker.patch.dict(
+            'netdumplings.console.sniff._chef_file_modules',
+            {chef_file: chef_file_module},
+            clear=True,
+        )
+        mock_spec = mocker.patch.object(
+            importlib.util, 'spec_from_file_location'
+        )
+        mocker.patch('netdumplings.DumplingKitchen')
+
+        network_sniffer(
+            'test_kitchen', 'test_interface', '', '',
+            {chef_file: ['ChefNameFromFile']},
+            'test_filter', 10, mocker.Mock(),
+        )
+
+        assert mock_spec.call_count == 0
+        assert file_chef_callable.call_count == 1
+
 
 class TestSniffListChefs:
     """
@@ -346,6 +390,17 @@ class TestSniffGetValidChefs:
         should be imported. We also request a missing chef, and check that a
         warning was logged for that one.
         """
+        def chef_module(*chef_class_names):
+            # A fake chef module. ValidOneBChef is unassignable.
+            return types.SimpleNamespace(**{
+                chef_class_name: types.SimpleNamespace(
+                    assignable_to_kitchen=chef_class_name != 'ValidOneBChef'
+                )
+                for chef_class_name in chef_class_names
+            })
+
+        file_module = chef_module('ValidFileChef')
+
         test_chef_info = {
             'moduleone': {
                 'import_error': False,
@@ -369,57 +424,20 @@ class TestSniffGetValidChefs:
             },
         }
 
-        mocker.patch(
-            'netdumplings.DumplingKitchen.get_chefs_in_modules',
-            return_value=test_chef_info,
-        )
-
-        # We retain a reference to the __import__ builtin, then we patch it for
-        # testing purposes. If we're not importing a test chef module then the
-        # patch will call the builtin __import__ instead.
-        builtin_import = builtins.__import__
-
-        # TODO: This feels too complicated.
-
-        def import_side_effect(*args, **kwargs):
-            if args[0] in test_chef_info.keys():
-                chef_classes = test_chef_info[args[0]]['chef_classes']
-                chef_module = types.SimpleNamespace()
-                for chef_class in chef_classes:
-                    setattr(
-                        chef_module,
-                        chef_class,
-                        types.SimpleNamespace(
-                            assignable_to_kitchen=(
-                                False if chef_class == 'ValidOneBChef'
-                                else True
-                            )
-                        )
-                    )
-                return chef_module
-            elif not isinstance(args[0], str):
-                # We're in the filemodule case.
-                chef_module = types.SimpleNamespace()
-                for chef_class in test_chef_info['filemodule']['chef_classes']:
-                    setattr(
-                        chef_module,
-                        chef_class,
-                        types.SimpleNamespace(
-                            assignable_to_kitchen=True
-                        )
-                    )
-                return chef_module
-
-            return builtin_import(*args, **kwargs)
+        test_modules = {
+            'moduleone': chef_module('ValidOneAChef', 'ValidOneBChef'),
+            'moduletwo': chef_module('ValidTwoAChef'),
+            'filemodule': file_module,
+        }
 
-        mocker.patch.object(
-            builtins, '__import__', side_effect=import_side_effect
+        mocker.patch(
+            'netdumplings.DumplingKitchen._import_chef_modules',
+            return_value=(test_chef_info, test_modules),
         )
 
-        mocker.patch.object(
-            importlib.util, 'module_from_spec', side_effect=import_side_effect
+        mocker.patch.dict(
+            'netdumplings.console.sniff._chef_file_modules', clear=True
         )
-        mocker.patch.object(importlib.util, 'spec_from_file_location')
 
         mock_log = mocker.Mock()
 
@@ -453,6 +471,9 @@ class TestSniffGetValidChefs:
             'Problem with bogusmodule: error string'
         )
 
+        # The module loaded from a file is kept for network_sniffer().
+        assert _chef_file_modules == {'filemodule': file_module}
+
 
 class TestSniffDumplingEmitter:
     """
@@ -489,6 +510,26 @@ class TestSniffDumplingEmitter:
             mock_send_dumplings_from_queue_to_hub.return_value
         )
 
+    def test_dumpling_emitter_uvloop(self, mocker):
+        """
+        Test that the dumpling emitter uses uvloop's event loop policy when
+        uvloop is available.
+        """
+        mock_uvloop = mocker.patch('netdumplings.console.sniff.uvloop')
+        mock_set_policy = mocker.patch('asyncio.set_event_loop_policy')
+        mock_run = mocker.patch('asyncio.run')
+        mocker.patch(
+            'netdumplings.console.sniff.send_dumplings_from_queue_to_hub',
+            new=mocker.Mock(),
+        )
+
+        dumpling_emitter('test_kitchen', 'test_hub:5000', mocker.Mock(), {})
+
+        mock_set_policy.assert_called_once_with(
+            mock_uvloop.EventLoopPolicy.return_value
+        )
+        mock_run.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_notify_shfty(
             self, mocker, test_dumpling_dns, test_dumpling_pktcount,
@@ -501,14 +542,15 @@ class TestSniffDumplingEmitter:
         """
         log = logging.getLogger('netdumplings.sniff')
 
-        # Mock the dumpling queue to contain a dumpling then throw a
-        # RuntimeError to break out of the infinite loop.
+        # Mock the dumpling queue to contain two batches of one dumpling each
+        # then throw a RuntimeError to break out of the infinite loop.
         mock_queue = mocker.Mock()
         mock_queue.get.side_effect = [
-            json.dumps(test_dumpling_dns),
-            json.dumps(test_dumpling_pktcount),
+            [json.dumps(test_dumpling_dns)],
+            [json.dumps(test_dumpling_pktcount)],
             RuntimeError,
         ]
+        mock_queue.get_nowait.side_effect = queue.Empty
 
         test_kitchen_name = 'test_kitchen'
         test_hub = 'test_hub:5000'
@@ -533,18 +575,155 @@ class TestSniffDumplingEmitter:
             pass
 
         # Check that we connected to the hub.
-        mock_websockets_connect.assert_called_with('ws://{}'.format(test_hub))
+        mock_websockets_connect.assert_called_with(
+            'ws://{}'.format(test_hub), compression=None, write_limit=2 ** 20,
+        )
 
         # Check that the kitchen announced itself first, before forwarding
         # a dumpling from the queue to the hub.
         assert mock_queue.get.call_count == 3
 
         assert mock_websocket.send.call_args_list == [
-            ((json.dumps(test_kitchen),),),
+            ((json.dumps(dict(test_kitchen, batch_dumplings=True)),),),
             ((json.dumps(test_dumpling_dns),),),
             ((json.dumps(test_dumpling_pktcount),),),
         ]
 
+    @pytest.mark.asyncio
+    async def test_batched_dumplings(
+            self, mocker, test_dumpling_dns, test_dumpling_pktcount,
+            test_kitchen):
+        """
+        Test that batches of dumplings which are already waiting on the
+        dumpling queue are sent to the hub in the same message as the batch
+        before them.
+        """
+        log = logging.getLogger('netdumplings.sniff')
+
+        mock_queue = mocker.Mock()
+        mock_queue.get.side_effect = [
+            [json.dumps(test_dumpling_dns)],
+            RuntimeError,
+        ]
+        mock_queue.get_nowait.side_effect = [
+            [json.dumps(test_dumpling_pktcount)],
+            queue.Empty,
+        ]
+
+        mock_websockets_connect = mocker.patch(
+            'websockets.client.connect',
+            new=asynctest.CoroutineMock(),
+        )
+
+        mock_websocket = mock_websockets_connect.return_value
+        mock_websocket.send = asynctest.CoroutineMock()
+
+        try:
+            await send_dumplings_from_queue_to_hub(
+                kitchen_name='test_kitchen',
+                hub='test_hub:5000',
+                dumpling_queue=mock_queue,
+                kitchen_info=test_kitchen,
+                log=log,
+            )
+        except RuntimeError:
+            pass
+
+        assert mock_websocket.send.call_args_list[1:] == [
+            (('\n'.join([
+                json.dumps(test_dumpling_dns),
+                json.dumps(test_dumpling_pktcount),
+            ]),),),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_batched_dumplings_size_limit(self, mocker, test_kitchen):
+        """
+        Test that dumplings which would take a message past
+        HUB_MAX_BATCH_SIZE dumplings are sent in the next message instead.
+        """
+        log = logging.getLogger('netdumplings.sniff')
+
+        mock_queue = mocker.Mock()
+        mock_queue.get.side_effect = [
+            ['a'] * (HUB_MAX_BATCH_SIZE - 40),
+            RuntimeError,
+        ]
+        mock_queue.get_nowait.side_effect = [
+            ['b'] * 30,
+            ['c'] * 30,
+            queue.Empty,
+        ]
+
+        mock_websockets_connect = mocker.patch(
+            'websockets.client.connect',
+            new=asynctest.CoroutineMock(),
+        )
+
+        mock_websocket = mock_websockets_connect.return_value
+        mock_websocket.send = asynctest.CoroutineMock()
+
+        try:
+            await send_dumplings_from_queue_to_hub(
+                kitchen_name='test_kitchen',
+                hub='test_hub:5000',
+                dumpling_queue=mock_queue,
+                kitchen_info=test_kitchen,
+                log=log,
+            )
+        except RuntimeError:
+            pass
+
+        assert mock_websocket.send.call_args_list[1:] == [
+            (('\n'.join(
+                ['a'] * (HUB_MAX_BATCH_SIZE - 40) + ['b'] * 30 + ['c'] * 10
+            ),),),
+            (('\n'.join(['c'] * 20),),),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_batched_dumplings_bytes_limit(self, mocker, test_kitchen):
+        """
+        Test that dumplings which would take a message past
+        HUB_MAX_BATCH_BYTES bytes are sent in the next message instead, and
+        that a dumpling which is too big on its own is sent by itself.
+        """
+        log = logging.getLogger('netdumplings.sniff')
+        mocker.patch('netdumplings._shared.HUB_MAX_BATCH_BYTES', 10)
+
+        mock_queue = mocker.Mock()
+        mock_queue.get.side_effect = [
+            ['aaaa', 'bbbb', 'cccc', 'x' * 20, 'dd'],
+            RuntimeError,
+        ]
+        mock_queue.get_nowait.side_effect = queue.Empty
+
+        mock_websockets_connect = mocker.patch(
+            'websockets.client.connect',
+            new=asynctest.CoroutineMock(),
+        )
+
+        mock_websocket = mock_websockets_connect.return_value
+        mock_websocket.send = asynctest.CoroutineMock()
+
+        try:
+            await send_dumplings_from_queue_to_hub(
+                kitchen_name='test_kitchen',
+                hub='test_hub:5000',
+                dumpling_queue=mock_queue,
+                kitchen_info=test_kitchen,
+                log=log,
+            )
+        except RuntimeError:
+            pass
+
+        assert mock_websocket.send.call_args_list[1:] == [
+            (('aaaa\nbbbb',),),
+            (('cccc',),),
+            (('x' * 20,),),
+            (('dd',),),
+        ]
+
     @pytest.mark.asyncio
     async def test_websocket_connection_problem(self, mocker, test_kitchen):
         """
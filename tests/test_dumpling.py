@@ -82,6 +82,14 @@ class TestDumpling:
         assert dumpling.creation_time == mock_time.return_value
         assert dumpling.payload is None
 
+    def test_no_instance_dict(self):
+        """
+        Test that Dumplings use slots rather than a per-instance __dict__.
+        """
+        dumpling = Dumpling(chef='test_chef', payload=None)
+
+        assert not hasattr(dumpling, '__dict__')
+
     def test_metadata(self, mocker, mock_chef, mock_time):
         """
         Test metadata keys in the to_json() result.
@@ -130,6 +138,16 @@ class TestDumpling:
 
         assert data['payload'] == test_payload
 
+    def test_to_json_payload_int_keys(self, mock_chef):
+        """
+        Test that integer payload keys are converted to strings in the
+        to_json() result.
+        """
+        dumpling = Dumpling(chef=mock_chef, payload={80: 'http'})
+        data = json.loads(dumpling.to_json())
+
+        assert data['payload'] == {'80': 'http'}
+
     def test_unserializable_payload(self, mock_chef):
         """
         Test an unserializable Dumpling payload.
@@ -151,6 +169,26 @@ class TestDumpling:
         assert dumpling.kitchen == 'default_kitchen'
         assert dumpling.payload == dumpling_dict['payload']
 
+    def test_from_json_bytes(self, dumpling_dict):
+        """
+        Test creating a dumpling from input JSON bytes.
+        """
+        dumpling = Dumpling.from_json(json.dumps(dumpling_dict).encode())
+
+        assert dumpling.chef == 'PacketCountChef'
+        assert dumpling.payload == dumpling_dict['payload']
+
+    @pytest.mark.parametrize('driver', ['bogus', ['packet'], None])
+    def test_from_json_invalid_driver(self, dumpling_dict, driver):
+        """
+        Test creating a dumpling from input JSON with an unknown driver.
+        Should raise InvalidDumpling.
+        """
+        dumpling_dict['metadata']['driver'] = driver
+
+        with pytest.raises(InvalidDumpling):
+            Dumpling.from_json(json.dumps(dumpling_dict))
+
     def test_from_json_invalid(self, dumpling_dict):
         """
         Test creating a dumpling from invalid input JSON. Should raise
@@ -79,6 +79,20 @@ class TestDumplingChef:
         assert dumpling is None
         assert mock_logger.debug.call_count >= 1
 
+    def test_default_handlers_debug_disabled(
+            self, mock_kitchen, mock_packet, mocker):
+        """
+        Test that the default handlers don't log anything when debug logging
+        is disabled.
+        """
+        chef = ChefForTests(kitchen=mock_kitchen)
+        mock_logger = mocker.patch.object(chef, '_logger')
+        mock_logger.isEnabledFor.return_value = False
+
+        chef.packet_handler(mock_packet)
+        chef.interval_handler(interval=5)
+        mock_logger.debug.assert_not_called()
+
     def test_repr(self, mocker):
         """
         Test the string representation.
@@ -132,7 +132,8 @@ class TestDumplingEater:
             "chef_filter=['ChefOne', 'ChefTwo'], "
             "on_connect={}, "
             "on_dumpling={}, "
-            "on_connection_lost={})".format(
+            "on_connection_lost={}, "
+            "batch_dumplings=False)".format(
                 '<callable: {}>'.format(handler.__name__),
                 '<callable: {}>'.format(handler.__name__),
                 '<callable: {}>'.format(handler.__name__),
@@ -290,6 +291,75 @@ class TestDumplingEaterGrabDumplings:
             ((dns_dumpling,),),
         ]
 
+    @pytest.mark.asyncio
+    async def test_sync_handlers(
+            self, mocker, mock_websocket, test_dumpling_dns):
+        """
+        Test that plain (non-async) handlers are called.
+        """
+        dns_dumpling = Dumpling.from_json(json.dumps(test_dumpling_dns))
+
+        mocker.patch(
+            'netdumplings.dumplingeater.Dumpling.from_json',
+            return_value=dns_dumpling,
+        )
+
+        mock_websocket.recv.side_effect = [
+            json.dumps(test_dumpling_dns),
+            websockets.exceptions.ConnectionClosed(1006, reason='unknown'),
+        ]
+
+        eater = DumplingEater(
+            on_connect=mocker.Mock(),
+            on_dumpling=mocker.Mock(),
+            on_connection_lost=mocker.Mock(),
+        )
+
+        await eater._grab_dumplings()
+
+        eater.on_connect.assert_called_once()
+        eater.on_dumpling.assert_called_once_with(dns_dumpling)
+        eater.on_connection_lost.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_batched_dumplings(
+            self, mocker, mock_websocket, test_dumpling_dns,
+            test_dumpling_pktcount):
+        """
+        Test that a batch eater announces itself as such and passes each
+        dumpling in a batched message to the on_dumpling handler.
+        """
+        mock_websocket.recv.side_effect = [
+            '\n'.join([
+                json.dumps(test_dumpling_dns),
+                json.dumps(test_dumpling_pktcount),
+            ]),
+            json.dumps(test_dumpling_dns),
+            RuntimeError,
+        ]
+
+        eater = DumplingEater(
+            name='test_eater',
+            on_connect=mocker.Mock(),
+            on_dumpling=mocker.Mock(),
+            on_connection_lost=mocker.Mock(),
+            batch_dumplings=True,
+        )
+
+        try:
+            await eater._grab_dumplings()
+        except RuntimeError:
+            pass
+
+        mock_websocket.send.assert_called_once_with(json.dumps({
+            'eater_name': 'test_eater',
+            'batch_dumplings': True,
+        }))
+
+        assert [
+            call[0][0].chef_name for call in eater.on_dumpling.call_args_list
+        ] == ['DNSLookupChef', 'PacketCountChef', 'DNSLookupChef']
+
     @pytest.mark.asyncio
     async def test_invalid_dumpling(
             self, mocker, mock_websocket, test_dumpling_dns,
@@ -7,7 +7,7 @@ import asynctest
 import pytest
 from websockets.exceptions import ConnectionClosed
 
-from netdumplings import DumplingDriver, DumplingHub
+from netdumplings import DumplingDriver, DumplingEater, DumplingHub
 from netdumplings.exceptions import NetDumplingsError
 
 
@@ -307,6 +307,52 @@ class TestDumplingGrabber:
         # Check that we counted the received dumpling.
         assert hub._system_stats['dumplings_in'] == 1
 
+    @pytest.mark.asyncio
+    async def test_batched_dumplings_from_kitchen(
+            self, mocker, test_kitchen, test_dumpling_pktcount,
+            test_dumpling_dns):
+        """
+        Test receiving a batch of newline-delimited dumplings from a kitchen
+        which announced that it sends batches. Each dumpling should be put
+        onto the eater queues separately.
+        """
+        mock_websocket = mocker.Mock()
+        mock_websocket.remote_address = ['kitchenhost', 11111]
+
+        mock_websocket.recv = asynctest.CoroutineMock(side_effect=[
+            json.dumps(dict(test_kitchen, batch_dumplings=True)),
+            '\n'.join([
+                json.dumps(test_dumpling_pktcount),
+                json.dumps(test_dumpling_dns),
+            ]),
+            RuntimeError,
+        ])
+
+        hub = DumplingHub()
+
+        # Set up a mock eater.
+        eater_1 = mocker.Mock()
+
+        hub._dumpling_eaters = {
+            eater_1: {
+                'queue': mocker.Mock(),
+            },
+        }
+
+        hub._dumpling_eaters[eater_1]['queue'].put = asynctest.CoroutineMock()
+
+        try:
+            await hub._grab_dumplings(mock_websocket, path=None)
+        except RuntimeError:
+            pass
+
+        assert hub._dumpling_eaters[eater_1]['queue'].put.call_args_list == [
+            ((json.dumps(test_dumpling_pktcount),),),
+            ((json.dumps(test_dumpling_dns),),),
+        ]
+
+        assert hub._system_stats['dumplings_in'] == 2
+
     @pytest.mark.asyncio
     async def test_invalid_dumpling_from_kitchen(
             self, mocker, test_kitchen, test_dumpling_pktcount):
@@ -355,6 +401,121 @@ class TestDumplingGrabber:
         assert hub._dumpling_eaters[eater_1]['queue'].put.call_count == 1
         assert hub._system_stats['dumplings_in'] == 1
 
+    @pytest.mark.asyncio
+    async def test_bytes_dumplings_from_kitchen(
+            self, mocker, test_kitchen, test_dumpling_pktcount,
+            test_dumpling_dns):
+        """
+        Test receiving dumplings from a kitchen as binary websocket messages.
+        The dumplings should be put onto the eater queues as strings so they
+        can be batched with other dumplings, and messages which aren't UTF-8
+        should be logged and skipped.
+        """
+        mock_websocket = mocker.Mock()
+        mock_websocket.remote_address = ['kitchenhost', 11111]
+
+        mock_websocket.recv = asynctest.CoroutineMock(side_effect=[
+            json.dumps(test_kitchen),
+            json.dumps(test_dumpling_pktcount).encode('utf-8'),
+            b'\xff\xfe',
+            json.dumps(test_dumpling_dns).encode('utf-8'),
+            RuntimeError,
+        ])
+
+        hub = DumplingHub()
+
+        # Set up a mock eater.
+        eater_1 = mocker.Mock()
+
+        hub._dumpling_eaters = {
+            eater_1: {
+                'queue': mocker.Mock(),
+            },
+        }
+
+        hub._dumpling_eaters[eater_1]['queue'].put = asynctest.CoroutineMock()
+
+        hub._logger = mocker.Mock()
+
+        try:
+            await hub._grab_dumplings(mock_websocket, path=None)
+        except RuntimeError:
+            pass
+
+        hub._logger.error.assert_called_once()
+
+        assert hub._dumpling_eaters[eater_1]['queue'].put.call_args_list == [
+            ((json.dumps(test_dumpling_pktcount),),),
+            ((json.dumps(test_dumpling_dns),),),
+        ]
+
+        assert hub._system_stats['dumplings_in'] == 2
+
+    @pytest.mark.asyncio
+    async def test_indented_dumpling_to_batching_eater(
+            self, mocker, test_kitchen, test_eater, test_dumpling_pktcount,
+            test_dumpling_dns):
+        """
+        Test that an indented dumpling from a kitchen which doesn't batch
+        reaches a batching eater intact, alongside another dumpling in the
+        same batch.
+        """
+        hub = DumplingHub()
+        eater_queue = asyncio.Queue()
+
+        # An indented dumpling and a compact one come in from the kitchen.
+        kitchen_websocket = mocker.Mock()
+        kitchen_websocket.remote_address = ['kitchenhost', 11111]
+        kitchen_websocket.recv = asynctest.CoroutineMock(side_effect=[
+            json.dumps(test_kitchen),
+            json.dumps(test_dumpling_pktcount, indent=2),
+            json.dumps(test_dumpling_dns),
+            RuntimeError,
+        ])
+
+        hub._dumpling_eaters = {mocker.Mock(): {'queue': eater_queue}}
+
+        try:
+            await hub._grab_dumplings(kitchen_websocket, path=None)
+        except RuntimeError:
+            pass
+
+        # The hub sends both dumplings to the batching eater in one message.
+        eater_websocket = mocker.Mock()
+        eater_websocket.remote_address = ['eaterhost', 22222]
+        eater_websocket.recv = asynctest.CoroutineMock(
+            return_value=json.dumps(dict(test_eater, batch_dumplings=True))
+        )
+        eater_websocket.send = asynctest.CoroutineMock(
+            side_effect=ConnectionClosed(1006, reason='unknown')
+        )
+
+        mocker.patch('asyncio.Queue', return_value=eater_queue)
+        await hub._emit_dumplings(eater_websocket, path=None)
+
+        message = eater_websocket.send.call_args[0][0]
+
+        # The eater gets both dumplings out of the message.
+        mock_connect = mocker.patch(
+            'websockets.client.connect',
+            new=asynctest.CoroutineMock(),
+        )
+        mock_connect.return_value.send = asynctest.CoroutineMock()
+        mock_connect.return_value.recv = asynctest.CoroutineMock(
+            side_effect=[message, RuntimeError]
+        )
+
+        eater = DumplingEater(on_dumpling=mocker.Mock(), batch_dumplings=True)
+
+        try:
+            await eater._grab_dumplings()
+        except RuntimeError:
+            pass
+
+        assert [
+            call[0][0].payload for call in eater.on_dumpling.call_args_list
+        ] == [test_dumpling_pktcount['payload'], test_dumpling_dns['payload']]
+
     @pytest.mark.asyncio
     async def test_kitchen_connection_closed(
             self, mocker, test_kitchen, test_dumpling_pktcount):
@@ -469,6 +630,95 @@ class TestDumplingEmitter:
             ((json.dumps(test_dumpling_dns),),),
         ]
 
+    @pytest.mark.asyncio
+    async def test_dumpling_emitter_batched(
+            self, mocker, test_eater, test_dumpling_pktcount,
+            test_dumpling_dns):
+        """
+        Test that an eater which asks for batched dumplings is sent all the
+        dumplings waiting in its queue as a single newline-delimited message.
+        """
+        mock_websocket = mocker.Mock()
+        mock_websocket.remote_address = ['eaterhost', 22222]
+
+        mock_websocket.recv = asynctest.CoroutineMock(
+            return_value=json.dumps(dict(test_eater, batch_dumplings=True))
+        )
+
+        mock_websocket.send = asynctest.CoroutineMock()
+
+        # The first dumpling is waited on, the second is already queued, and
+        # then RuntimeError breaks out of the hub's infinite loop.
+        mock_queue = mocker.patch('asyncio.Queue')
+        mock_queue.return_value.get = asynctest.CoroutineMock(
+            side_effect=[json.dumps(test_dumpling_pktcount), RuntimeError]
+        )
+        mock_queue.return_value.get_nowait = mocker.Mock(
+            side_effect=[json.dumps(test_dumpling_dns), asyncio.QueueEmpty]
+        )
+
+        hub = DumplingHub()
+
+        try:
+            await hub._emit_dumplings(mock_websocket, path=None)
+        except RuntimeError:
+            pass
+
+        assert hub._system_stats['dumplings_out'] == 2
+
+        mock_websocket.send.assert_called_once_with('\n'.join([
+            json.dumps(test_dumpling_pktcount),
+            json.dumps(test_dumpling_dns),
+        ]))
+
+    @pytest.mark.asyncio
+    async def test_dumpling_emitter_batched_bytes_limit(
+            self, mocker, test_eater, test_dumpling_pktcount,
+            test_dumpling_dns):
+        """
+        Test that a dumpling which would take a batched message past
+        HUB_MAX_BATCH_BYTES bytes is sent in the next message instead.
+        """
+        mocker.patch(
+            'netdumplings._shared.HUB_MAX_BATCH_BYTES',
+            len(json.dumps(test_dumpling_pktcount)) + 1,
+        )
+
+        mock_websocket = mocker.Mock()
+        mock_websocket.remote_address = ['eaterhost', 22222]
+
+        mock_websocket.recv = asynctest.CoroutineMock(
+            return_value=json.dumps(dict(test_eater, batch_dumplings=True))
+        )
+
+        mock_websocket.send = asynctest.CoroutineMock()
+
+        mock_queue = mocker.patch('asyncio.Queue')
+        mock_queue.return_value.get = asynctest.CoroutineMock(
+            side_effect=[json.dumps(test_dumpling_pktcount), RuntimeError]
+        )
+        mock_queue.return_value.get_nowait = mocker.Mock(
+            side_effect=[
+                json.dumps(test_dumpling_dns),
+                asyncio.QueueEmpty,
+                asyncio.QueueEmpty,
+            ]
+        )
+
+        hub = DumplingHub()
+
+        try:
+            await hub._emit_dumplings(mock_websocket, path=None)
+        except RuntimeError:
+            pass
+
+        assert mock_websocket.send.call_args_list == [
+            ((json.dumps(test_dumpling_pktcount),),),
+            ((json.dumps(test_dumpling_dns),),),
+        ]
+
+        assert hub._system_stats['dumplings_out'] == 2
+
     @pytest.mark.asyncio
     async def test_eater_connection_closed(
             self, mocker, test_eater, test_dumpling_pktcount):
@@ -1,6 +1,8 @@
 import importlib
 import importlib.util
 import json
+import queue
+import threading
 
 import pytest
 
@@ -76,7 +78,9 @@ class TestDumplingKitchen:
             "name={}, "
             "interface={}, "
             "sniffer_filter={}, "
-            "chef_poke_interval={})".format(
+            "chef_poke_interval={}, "
+            "dumpling_batch_size=None, "
+            "dumpling_batch_interval=0.005)".format(
                 repr(kitchen.dumpling_queue),
                 repr(kitchen.name),
                 repr(kitchen.interface),
@@ -308,7 +312,173 @@ class TestDumplingSends:
             driver=DumplingDriver.packet,
         )
 
-        mock_queue.put.assert_called_once_with(test_payload_json)
+        mock_queue.put_nowait.assert_called_once_with(test_payload_json)
+
+    def test_dumpling_send_queue_full(self, mocker, test_dumpling_dns):
+        """
+        Test that a dumpling is dropped (and a warning logged) when the
+        dumpling queue is full.
+        """
+        mocker.patch('netdumplings.dumplingkitchen.Dumpling')
+
+        mock_queue = mocker.Mock()
+        mock_queue.put_nowait.side_effect = queue.Full
+
+        kitchen = DumplingKitchen(dumpling_queue=mock_queue)
+        mock_logger = mocker.patch.object(kitchen, '_logger')
+
+        for _ in range(2):
+            kitchen._put_dumpling_on_queue(
+                chef=mocker.Mock(),
+                payload=test_dumpling_dns['payload'],
+                driver=DumplingDriver.packet,
+            )
+
+        assert kitchen._dumplings_dropped == 2
+
+        # Only the first drop is logged.
+        mock_logger.warning.assert_called_once()
+
+    def test_dumpling_send_batched(self, mocker):
+        """
+        Test that a batching kitchen puts dumplings on the queue as a list
+        once it has a full batch.
+        """
+        mock_dumpling_class = mocker.patch(
+            'netdumplings.dumplingkitchen.Dumpling'
+        )
+
+        mock_dumpling_class.return_value.to_json.side_effect = [
+            'dumpling_1', 'dumpling_2', 'dumpling_3',
+        ]
+
+        mock_queue = mocker.Mock()
+        kitchen = DumplingKitchen(
+            dumpling_queue=mock_queue, dumpling_batch_size=2,
+        )
+
+        for _ in range(3):
+            kitchen._put_dumpling_on_queue(
+                chef=mocker.Mock(),
+                payload='test_payload',
+                driver=DumplingDriver.packet,
+            )
+
+        mock_queue.put_nowait.assert_called_once_with(
+            ['dumpling_1', 'dumpling_2']
+        )
+
+        # Flushing puts the partial batch on the queue.
+        kitchen._flush_dumpling_batch()
+
+        assert mock_queue.put_nowait.call_args_list[1:] == [
+            ((['dumpling_3'],),),
+        ]
+
+        # Flushing an empty batch does nothing.
+        kitchen._flush_dumpling_batch()
+
+        assert mock_queue.put_nowait.call_count == 2
+
+    def test_dumpling_batch_flushed_after_interval(self, mocker):
+        """
+        Test that the batch flushing thread puts a partial batch on the queue
+        once its interval is up, but leaves full batches alone.
+        """
+        mock_dumpling_class = mocker.patch(
+            'netdumplings.dumplingkitchen.Dumpling'
+        )
+
+        mock_dumpling_class.return_value.to_json.side_effect = [
+            'dumpling_1', 'dumpling_2', 'dumpling_3',
+        ]
+
+        partial_batch_flushed = threading.Event()
+
+        def put_nowait(batch):
+            if batch == ['dumpling_3']:
+                partial_batch_flushed.set()
+
+        mock_queue = mocker.Mock()
+        mock_queue.put_nowait.side_effect = put_nowait
+
+        kitchen = DumplingKitchen(
+            dumpling_queue=mock_queue, dumpling_batch_size=2,
+        )
+
+        threading.Thread(
+            target=kitchen._flush_dumpling_batches,
+            kwargs={'interval': 0.01},
+            daemon=True,
+        ).start()
+
+        for _ in range(3):
+            kitchen._put_dumpling_on_queue(
+                chef=mocker.Mock(),
+                payload='test_payload',
+                driver=DumplingDriver.packet,
+            )
+
+        assert partial_batch_flushed.wait(timeout=5)
+        assert mock_queue.put_nowait.call_args_list == [
+            ((['dumpling_1', 'dumpling_2'],),),
+            ((['dumpling_3'],),),
+        ]
+
+    def test_dumpling_send_batched_queue_full(self, mocker):
+        """
+        Test that every dumpling in a batch is counted as dropped when the
+        dumpling queue is full.
+        """
+        mocker.patch('netdumplings.dumplingkitchen.Dumpling')
+
+        mock_queue = mocker.Mock()
+        mock_queue.put_nowait.side_effect = queue.Full
+
+        kitchen = DumplingKitchen(
+            dumpling_queue=mock_queue, dumpling_batch_size=3,
+        )
+        mock_logger = mocker.patch.object(kitchen, '_logger')
+
+        for _ in range(3):
+            kitchen._put_dumpling_on_queue(
+                chef=mocker.Mock(),
+                payload='test_payload',
+                driver=DumplingDriver.packet,
+            )
+
+        assert kitchen._dumplings_dropped == 3
+        mock_logger.warning.assert_called_once_with(
+            'default: Dumpling queue is full of batches; 3 dumpling(s) dropped'
+        )
+
+    def test_dumpling_batches_put_under_lock(self, mocker):
+        """
+        Test that full and flushed batches are put on the queue while the
+        batch lock is held, so batches from different threads stay in order.
+        """
+        mocker.patch('netdumplings.dumplingkitchen.Dumpling')
+
+        mock_queue = mocker.Mock()
+        kitchen = DumplingKitchen(
+            dumpling_queue=mock_queue, dumpling_batch_size=2,
+        )
+
+        def put_nowait(batch):
+            assert kitchen._dumpling_batch_lock.locked()
+
+        mock_queue.put_nowait.side_effect = put_nowait
+
+        for _ in range(3):
+            kitchen._put_dumpling_on_queue(
+                chef=mocker.Mock(),
+                payload='test_payload',
+                driver=DumplingDriver.packet,
+            )
+
+        kitchen._flush_dumpling_batch()
+
+        assert mock_queue.put_nowait.call_count == 2
 
 
 class TestChefDiscovery:
@@ -388,6 +558,7 @@ class TestChefDiscovery:
         assert sorted(chef_module['chef_classes']) == sorted([
             'ChefOneFromFile', 'ChefTwoFromFile',
         ])
+        assert 'module' not in chef_module
 
     def test_chef_discovery_with_invalid_module(self, mocker):
         """
@@ -431,6 +602,25 @@ class TestChefDiscovery:
             'does not appear to be an importable Python file'
         )
 
+    def test_chef_modules_returned(self, mocker):
+        """
+        Test that the modules imported while discovering chefs are returned
+        alongside the chef information, for nd-sniff to reuse.
+        """
+        chef_file = 'tests/data/chefs_in_a_file.py'
+
+        chef_info, modules = DumplingKitchen._import_chef_modules([
+            chef_file,
+            'tests.data.doesnotexist',
+        ])
+
+        assert chef_info == DumplingKitchen.get_chefs_in_modules([
+            chef_file,
+            'tests.data.doesnotexist',
+        ])
+        assert list(modules.keys()) == [chef_file]
+        assert hasattr(modules[chef_file], 'ChefOneFromFile')
+
 
 class TestKitchenRun:
     """
@@ -471,6 +661,52 @@ class TestKitchenRun:
         kitchen.run()
         mock_thread.assert_not_called()
 
+    def test_batch_flush_thread_started(self, mocker):
+        """
+        Test that the batch flushing thread is started when dumpling batching
+        is enabled.
+        """
+        kitchen = DumplingKitchen(
+            dumpling_queue=mocker.Mock(),
+            chef_poke_interval=None,
+            dumpling_batch_size=10,
+            dumpling_batch_interval=0.1,
+        )
+
+        mock_thread = mocker.patch('netdumplings.dumplingkitchen.Thread')
+        mocker.patch('netdumplings.dumplingkitchen.sniff')
+
+        kitchen.run()
+        mock_thread.assert_called_once_with(
+            target=kitchen._flush_dumpling_batches,
+            kwargs={'interval': 0.1},
+            daemon=True,
+        )
+
+    def test_batch_flushed_when_sniffer_stops(self, mocker):
+        """
+        Test that a partial batch of dumplings is put on the queue when the
+        sniffer stops.
+        """
+        mock_queue = mocker.Mock()
+
+        kitchen = DumplingKitchen(
+            dumpling_queue=mock_queue,
+            chef_poke_interval=None,
+            dumpling_batch_size=10,
+        )
+
+        mocker.patch('netdumplings.dumplingkitchen.Thread')
+        mocker.patch(
+            'netdumplings.dumplingkitchen.sniff',
+            side_effect=lambda **kwargs: kitchen._dumpling_batch.append(
+                'dumpling_1'
+            ),
+        )
+
+        kitchen.run()
+        mock_queue.put_nowait.assert_called_once_with(['dumpling_1'])
+
     def test_sniffer_started_with_specified_interface(self, mocker):
         """
         Test that the sniffer was started with the specified interface.
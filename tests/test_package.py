@@ -1,3 +1,5 @@
+import pytest
+
 import netdumplings
 from netdumplings._version import __version__
 
@@ -12,3 +14,33 @@ class TestPackage:
         it matches the version in netdumplings/_version.py.
         """
         assert netdumplings.__version__ == __version__
+
+    def test_lazy_exports(self):
+        """
+        Test that the lazily-exported classes resolve to the same objects as
+        their defining modules.
+        """
+        from netdumplings.dumpling import Dumpling, DumplingDriver
+        from netdumplings.dumplinghub import DumplingHub
+
+        assert netdumplings.Dumpling is Dumpling
+        assert netdumplings.DumplingDriver is DumplingDriver
+        assert netdumplings.DumplingHub is DumplingHub
+
+    def test_lazy_exceptions(self):
+        """
+        Test that the exception classes are exported by the package.
+        """
+        from netdumplings import exceptions
+
+        assert netdumplings.NetDumplingsError is exceptions.NetDumplingsError
+        assert netdumplings.InvalidDumpling is exceptions.InvalidDumpling
+        assert (netdumplings.InvalidDumplingPayload is
+                exceptions.InvalidDumplingPayload)
+
+    def test_unknown_attribute(self):
+        """
+        Test that unknown package attributes still raise AttributeError.
+        """
+        with pytest.raises(AttributeError):
+            netdumplings.NotARealThing
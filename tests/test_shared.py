@@ -1,12 +1,19 @@
+import datetime
+import importlib
 import json
 import logging
 import logging.config
+import math
+import sys
 import time
 
 import pytest
 
+import netdumplings._shared
 from netdumplings.exceptions import InvalidDumpling
-from netdumplings._shared import configure_logging, validate_dumpling
+from netdumplings._shared import (
+    batch_length, configure_logging, validate_dumpling, HUB_MAX_BATCH_SIZE,
+)
 
 
 @pytest.fixture(scope='function')
@@ -28,6 +35,23 @@ def packet_dumpling_dict():
     }
 
 
+@pytest.fixture(params=['orjson', 'no orjson'])
+def shared(request):
+    """
+    The _shared module, imported with and without orjson available.
+    """
+    if request.param == 'orjson':
+        pytest.importorskip('orjson')
+        yield netdumplings._shared
+        return
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setitem(sys.modules, 'orjson', None)
+        yield importlib.reload(netdumplings._shared)
+
+    importlib.reload(netdumplings._shared)
+
+
 class TestShared:
     """
     Test shared utility functions.
@@ -39,6 +63,14 @@ class TestShared:
         assert validate_dumpling(
             json.dumps(packet_dumpling_dict)) == packet_dumpling_dict
 
+    def test_valid_dumpling_bytes(self, packet_dumpling_dict):
+        """
+        Test validation of JSON-serialized dumplings provided as bytes.
+        """
+        assert validate_dumpling(
+            json.dumps(packet_dumpling_dict).encode('utf-8')
+        ) == packet_dumpling_dict
+
     def test_dumpling_with_missing_chef(self, packet_dumpling_dict):
         """
         Test dumpling missing a chef name.
@@ -66,6 +98,19 @@ class TestShared:
         assert logging.Formatter.default_time_format == '%Y-%m-%dT%H:%M:%S'
         assert logging.Formatter.default_msec_format == '%s.%03d'
 
+    def test_logging_formatter_force(self, monkeypatch):
+        """
+        Test that the logging formatter is only reconfigured when forced.
+        """
+        configure_logging()
+        monkeypatch.setattr(logging.Formatter, 'converter', time.localtime)
+
+        configure_logging()
+        assert logging.Formatter.converter == time.localtime
+
+        configure_logging(force=True)
+        assert logging.Formatter.converter == time.gmtime
+
     def test_logging_config_file(self, monkeypatch):
         """
         Test NETDUMPLINGS_LOGGING_CONFIG environment variable for setting the
@@ -128,3 +173,138 @@ class TestShared:
         configure_logging(logging.DEBUG)
 
         spy_basic_config.assert_called_once_with(level=logging.DEBUG)
+
+
+class TestJSON:
+    """
+    Test that JSON handling is the same with and without orjson.
+    """
+    @pytest.mark.parametrize('json_str', [
+        '{"value": NaN}',
+        b'{"value": NaN}',
+        '{"value": Infinity}',
+    ])
+    def test_loads_non_finite(self, shared, json_str):
+        """
+        Test that NaN and Infinity are deserialized to floats.
+        """
+        value = shared.json_loads(json_str)['value']
+        assert math.isnan(value) or math.isinf(value)
+
+    @pytest.mark.parametrize('json_str', [
+        '{"value": 123456789012345678901234567890}',
+        b'{"value": 123456789012345678901234567890}',
+        '{"value": -123456789012345678901234567890}',
+    ])
+    def test_loads_big_int(self, shared, json_str):
+        """
+        Test that integers wider than 64 bits are deserialized exactly.
+        """
+        assert abs(shared.json_loads(json_str)['value']) == (
+            123456789012345678901234567890
+        )
+
+    def test_loads_invalid(self, shared):
+        """
+        Test that invalid JSON raises JSONDecodeError.
+        """
+        with pytest.raises(json.JSONDecodeError):
+            shared.json_loads('{"value": ')
+
+    def test_loads_big_float(self, shared):
+        """
+        Test that big floats are still deserialized as floats.
+        """
+        assert shared.json_loads('{"value": [1e300]}') == {'value': [1e300]}
+
+    @pytest.mark.parametrize('obj, expected', [
+        ({'value': float('nan')}, '{"value":NaN}'),
+        ({'value': [float('-inf')]}, '{"value":[-Infinity]}'),
+        ({'one': 1, 'none': None}, '{"one":1,"none":null}'),
+        ({'value': 'null'}, '{"value":"null"}'),
+        ({'value': [2 ** 70, 1.5]}, '{"value":[1180591620717411303424,1.5]}'),
+        ({'value': '\u00e9'}, '{"value":"\u00e9"}'),
+    ])
+    def test_dumps_format(self, shared, obj, expected):
+        """
+        Test that objects are serialized in the same compact format whichever
+        serializer is used.
+        """
+        assert shared.json_dumps(obj) == expected
+
+    @pytest.mark.parametrize('obj, expected', [
+        ({'b': None, 'a': [1]}, '{\n  "a": [\n    1\n  ],\n  "b": null\n}'),
+        ({'a': float('nan')}, '{\n  "a": NaN\n}'),
+        ({'a': 2 ** 70}, '{\n  "a": 1180591620717411303424\n}'),
+    ])
+    def test_dumps_pretty(self, shared, obj, expected):
+        """
+        Test that pretty output is sorted and indented the same way whichever
+        serializer is used.
+        """
+        assert shared.json_dumps(obj, pretty=True) == expected
+
+    def test_dumps_null_not_reserialized(self, shared, mocker):
+        """
+        Test that objects containing None are only serialized once.
+        """
+        if shared.orjson is None:
+            pytest.skip('orjson is not installed')
+
+        mock_dumps = mocker.patch('json.dumps')
+
+        assert shared.json_dumps({'kitchen': None}) == '{"kitchen":null}'
+        mock_dumps.assert_not_called()
+
+    def test_dumps_big_int(self, shared):
+        """
+        Test that integers wider than 64 bits are serialized exactly.
+        """
+        serialized = shared.json_dumps({'value': 2 ** 70, 'other': None})
+        assert json.loads(serialized) == {'value': 2 ** 70, 'other': None}
+
+    def test_dumps_non_str_keys(self, shared):
+        """
+        Test that non-string dict keys are converted to strings.
+        """
+        assert json.loads(shared.json_dumps({1: 'one'})) == {'1': 'one'}
+
+    @pytest.mark.parametrize('value', [
+        time.gmtime,
+        datetime.datetime(2018, 1, 1),
+    ])
+    def test_dumps_unserializable(self, shared, value):
+        """
+        Test that objects json.dumps can't serialize raise TypeError.
+        """
+        with pytest.raises(TypeError):
+            shared.json_dumps({'value': value})
+
+
+class TestBatchLength:
+    """
+    Test working out how many dumplings fit into a batched message.
+    """
+    @pytest.mark.parametrize('dumpling_jsons, expected', [
+        (['aaaa'], 1),
+        (['aaaa', 'bbbb'], 2),
+        (['aaaa', 'bbbb', 'cccc'], 2),
+        (['x' * 20, 'aaaa'], 1),
+        (['aaa', '\u00e9\u00e9\u00e9', 'bb'], 2),
+    ])
+    def test_bytes_limit(self, mocker, dumpling_jsons, expected):
+        """
+        Test that batches are limited by their UTF-8 encoded size, and that
+        the first dumpling always fits.
+        """
+        mocker.patch('netdumplings._shared.HUB_MAX_BATCH_BYTES', 10)
+
+        assert batch_length(dumpling_jsons) == expected
+
+    def test_size_limit(self):
+        """
+        Test that batches are limited to HUB_MAX_BATCH_SIZE dumplings.
+        """
+        assert batch_length(['{}'] * (HUB_MAX_BATCH_SIZE + 1)) == (
+            HUB_MAX_BATCH_SIZE
+        )